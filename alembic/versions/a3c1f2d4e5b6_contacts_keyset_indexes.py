@@ -0,0 +1,30 @@
+"""contacts keyset pagination indexes
+
+Revision ID: a3c1f2d4e5b6
+Revises: 58dd8ce78241
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f2d4e5b6'
+down_revision: Union[str, None] = '58dd8ce78241'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contacts_user_id_id', 'contacts', ['user_id', 'id'])
+    op.create_index('ix_contacts_user_id_email_id', 'contacts', ['user_id', 'email', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id_email_id', table_name='contacts')
+    op.drop_index('ix_contacts_user_id_id', table_name='contacts')
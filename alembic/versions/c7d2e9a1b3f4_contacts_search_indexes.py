@@ -0,0 +1,47 @@
+"""contacts full-text and trigram search indexes
+
+Revision ID: c7d2e9a1b3f4
+Revises: a3c1f2d4e5b6
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9a1b3f4'
+down_revision: Union[str, None] = 'a3c1f2d4e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Вираз має збігатися з app.src.services.search.search_vector().
+    op.execute(
+        "CREATE INDEX ix_contacts_search_tsv ON contacts USING gin "
+        "(to_tsvector('simple'::regconfig, coalesce(name, '') || ' ' || coalesce(email, '')))"
+    )
+    op.create_index(
+        'ix_contacts_name_trgm', 'contacts', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_contacts_email_trgm', 'contacts', ['email'],
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_contacts_email_trgm', table_name='contacts')
+    op.drop_index('ix_contacts_name_trgm', table_name='contacts')
+    op.drop_index('ix_contacts_search_tsv', table_name='contacts')
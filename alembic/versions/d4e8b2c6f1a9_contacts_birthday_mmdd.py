@@ -0,0 +1,43 @@
+"""contacts birthday and birthday_mmdd columns
+
+Revision ID: d4e8b2c6f1a9
+Revises: c7d2e9a1b3f4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8b2c6f1a9'
+down_revision: Union[str, None] = 'c7d2e9a1b3f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('birthday', sa.Date(), nullable=True))
+    op.add_column('contacts', sa.Column('birthday_mmdd', sa.Integer(), nullable=True))
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "UPDATE contacts SET birthday_mmdd = "
+            "EXTRACT(MONTH FROM birthday)::int * 100 + EXTRACT(DAY FROM birthday)::int "
+            "WHERE birthday IS NOT NULL"
+        )
+    else:
+        op.execute(
+            "UPDATE contacts SET birthday_mmdd = CAST(strftime('%m%d', birthday) AS INTEGER) "
+            "WHERE birthday IS NOT NULL"
+        )
+    op.create_index('ix_contacts_user_id_birthday_mmdd', 'contacts', ['user_id', 'birthday_mmdd'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id_birthday_mmdd', table_name='contacts')
+    op.drop_column('contacts', 'birthday_mmdd')
+    op.drop_column('contacts', 'birthday')
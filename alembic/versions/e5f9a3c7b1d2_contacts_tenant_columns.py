@@ -0,0 +1,111 @@
+"""contacts first/last name columns and tenant-scoped indexes
+
+Revision ID: e5f9a3c7b1d2
+Revises: d4e8b2c6f1a9
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f9a3c7b1d2'
+down_revision: Union[str, None] = 'd4e8b2c6f1a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Вираз має збігатися з app.src.services.search.search_vector().
+SEARCH_TSV = (
+    "to_tsvector('simple'::regconfig, coalesce(first_name, '') || ' ' || "
+    "coalesce(last_name, '') || ' ' || coalesce(email, ''))"
+)
+LEGACY_SEARCH_TSV = "to_tsvector('simple'::regconfig, coalesce(name, '') || ' ' || coalesce(email, ''))"
+
+
+def _drop_index_if_exists(name: str) -> None:
+    # ix_contacts_email створювався create_all(), а не міграціями.
+    if name in {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('contacts')}:
+        op.drop_index(name, table_name='contacts')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+
+    op.add_column('contacts', sa.Column('first_name', sa.String(), nullable=True))
+    op.add_column('contacts', sa.Column('last_name', sa.String(), nullable=True))
+    op.add_column('contacts', sa.Column('additional_info', sa.String(), nullable=True))
+
+    # "Ім'я Прізвище" з колонки name: до першого пробілу і решта.
+    if postgres:
+        op.execute(
+            "UPDATE contacts SET "
+            "first_name = split_part(coalesce(name, ''), ' ', 1), "
+            "last_name = coalesce(substr(name, strpos(name || ' ', ' ') + 1), '')"
+        )
+        op.drop_index('ix_contacts_name_trgm', table_name='contacts')
+        op.drop_index('ix_contacts_search_tsv', table_name='contacts')
+    else:
+        op.execute(
+            "UPDATE contacts SET "
+            "first_name = substr(coalesce(name, ''), 1, instr(coalesce(name, '') || ' ', ' ') - 1), "
+            "last_name = substr(coalesce(name, ''), instr(coalesce(name, '') || ' ', ' ') + 1)"
+        )
+
+    # Глобально унікальний email замінюється унікальністю в межах користувача.
+    _drop_index_if_exists('ix_contacts_email')
+    op.drop_index('ix_contacts_user_id_email_id', table_name='contacts')
+    with op.batch_alter_table('contacts') as batch:
+        batch.alter_column('phone', new_column_name='phone_number')
+        batch.drop_column('name')
+
+    op.create_index('ix_contacts_user_id_email', 'contacts', ['user_id', 'email'], unique=True)
+    op.create_index(
+        'ix_contacts_user_id_last_name_first_name', 'contacts',
+        ['user_id', 'last_name', 'first_name']
+    )
+    op.create_index('ix_contacts_user_id_birthday', 'contacts', ['user_id', 'birthday'])
+
+    if postgres:
+        op.execute(f"CREATE INDEX ix_contacts_search_tsv ON contacts USING gin ({SEARCH_TSV})")
+        for column in ('first_name', 'last_name'):
+            op.create_index(
+                f'ix_contacts_{column}_trgm', 'contacts', [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+
+    if postgres:
+        op.drop_index('ix_contacts_last_name_trgm', table_name='contacts')
+        op.drop_index('ix_contacts_first_name_trgm', table_name='contacts')
+        op.drop_index('ix_contacts_search_tsv', table_name='contacts')
+    op.drop_index('ix_contacts_user_id_birthday', table_name='contacts')
+    op.drop_index('ix_contacts_user_id_last_name_first_name', table_name='contacts')
+    op.drop_index('ix_contacts_user_id_email', table_name='contacts')
+
+    with op.batch_alter_table('contacts') as batch:
+        batch.add_column(sa.Column('name', sa.String(), nullable=True))
+        batch.alter_column('phone_number', new_column_name='phone')
+    op.execute("UPDATE contacts SET name = trim(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))")
+    with op.batch_alter_table('contacts') as batch:
+        batch.drop_column('additional_info')
+        batch.drop_column('last_name')
+        batch.drop_column('first_name')
+
+    # Не вдасться, якщо різні користувачі вже мають контакти з однаковим email.
+    op.create_index('ix_contacts_email', 'contacts', ['email'], unique=True)
+    op.create_index('ix_contacts_user_id_email_id', 'contacts', ['user_id', 'email', 'id'])
+
+    if postgres:
+        op.execute(f"CREATE INDEX ix_contacts_search_tsv ON contacts USING gin ({LEGACY_SEARCH_TSV})")
+        op.create_index(
+            'ix_contacts_name_trgm', 'contacts', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        )
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select  
 from app.src.database.database import get_db
 from app.src.database.models import Contact, User
+from app.src.repository import contacts as repository_contacts
 from app.src.schemas.contact import ContactCreate, ContactUpdate, ContactResponse
 from app.src.services.auth import get_current_user  
 
@@ -27,10 +28,4 @@ async def read_contacts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Contact)
-        .where(Contact.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
\ No newline at end of file
+    return await repository_contacts.get_contacts(db, current_user.id, skip=skip, limit=limit)
\ No newline at end of file
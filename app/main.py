@@ -1,11 +1,88 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import FastAPI
+from fastapi_limiter import FastAPILimiter
+from fastapi.staticfiles import StaticFiles
+from app.src.config.config import settings
 from app.src.routes.auth import router as auth_router
 from app.src.routes.contacts import router as contacts_router
+from app.src.routes.metrics import router as metrics_router
+from app.src.routes.health import router as health_router
+from app.src.routes.admin import router as admin_router
+from app.src.database.base import warm_up_engine, dispose_engine
+from app.src.database.redis import init_redis, close_redis, warm_up_redis
+from app.src.database.replicas import replica_router
+from app.src.monitoring.instrumentation import InstrumentationMiddleware
+from app.src.monitoring.loop_lag import LoopLagMonitor
+from app.src.monitoring.profiling import ProfilingMiddleware
+from app.src.monitoring.metrics import registry
+from app.src.services import avatars
+from app.src.services.body_limit import BodySizeLimitMiddleware
+from app.src.services.passwords import password_hasher
+from app.src.services.tokens import get_token_service
+from app.src.services.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+warmup_seconds = registry.gauge("app_warmup_seconds", "Тривалість прогріву під час старту")
+ready_gauge = registry.gauge("app_ready", "1, коли застосунок прогрітий і приймає трафік")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    start = time.perf_counter()
+
+    # Завершення кожного кроку реєструється до його старту: якщо старт
+    # падає на середині, зупиняється лише те, що вже встигло запуститися.
+    async with AsyncExitStack() as stack:
+        stack.push_async_callback(dispose_engine)
+
+        # Один пул Redis на процес: ним користуються rate limiter, кеші та черги
+        stack.push_async_callback(close_redis)
+        redis_client = await init_redis()
+        await FastAPILimiter.init(redis_client)
+        stack.push_async_callback(user_cache.stop)
+        await user_cache.start()
+
+        # З'єднання, бекенд bcrypt і схема OpenAPI готуються до першого запиту,
+        # а не під час нього.
+        stack.callback(password_hasher.shutdown)
+        db_connections, redis_connections, _ = await asyncio.gather(
+            warm_up_engine(),
+            warm_up_redis(),
+            password_hasher.warm_up()
+        )
+        app.openapi()
+        get_token_service()
+        stack.push_async_callback(replica_router.stop)
+        await replica_router.start()
+
+        stack.push_async_callback(avatars.drain, settings.shutdown_grace_seconds)
+        if settings.loop_lag_monitor_enabled:
+            loop_monitor = LoopLagMonitor(settings.loop_lag_threshold_ms / 1000)
+            stack.push_async_callback(loop_monitor.stop)
+            await loop_monitor.start()
+
+        warmup_seconds.set(time.perf_counter() - start)
+        app.state.ready = True
+        ready_gauge.set(1)
+        logger.info(
+            f"Warm-up finished in {time.perf_counter() - start:.2f}s: "
+            f"{db_connections} DB and {redis_connections} Redis connections"
+        )
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            ready_gauge.set(0)
 
 app = FastAPI(
     title="Contacts API",
     description="API for managing contacts",
     version="1.0.0",
+    lifespan=lifespan,
     swagger_ui_parameters={
         "oauth2RedirectUrl": "/docs/oauth2-redirect",
         "persistAuthorization": True
@@ -13,4 +90,28 @@ app = FastAPI(
 )
 
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
-app.include_router(contacts_router, prefix="/contacts", tags=["contacts"])
\ No newline at end of file
+app.include_router(contacts_router, prefix="/contacts", tags=["contacts"])
+app.include_router(metrics_router)
+app.include_router(health_router)
+app.include_router(admin_router)
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={("PATCH", app.url_path_for("update_avatar")): settings.avatar_max_bytes + avatars.MULTIPART_OVERHEAD}
+)
+app.add_middleware(
+    ProfilingMiddleware,
+    interval=settings.profiler_request_interval_ms / 1000
+)
+app.add_middleware(
+    InstrumentationMiddleware,
+    server_timing=settings.server_timing_enabled,
+    n_plus_one_threshold=settings.n_plus_one_threshold
+)
+
+if settings.avatar_storage == "local":
+    app.mount(
+        settings.avatar_base_url,
+        StaticFiles(directory=settings.avatar_local_dir, check_dir=False),
+        name="avatars"
+    )
@@ -3,7 +3,8 @@ from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from jose import JWTError, jwt
+from sqlalchemy.orm import undefer
+from app.src.services.tokens import PyJWTError as JWTError, get_token_service
 from passlib.context import CryptContext
 from fastapi_limiter.depends import RateLimiter
 
@@ -20,7 +21,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 async def get_user_by_email(email: str, db: AsyncSession) -> User | None:
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(select(User).where(User.email == email).options(undefer(User.password)))
     return result.scalar_one_or_none()  
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
@@ -30,7 +31,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"}, 
     )
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])  
+        payload = get_token_service().decode(token)  
         email: str = payload.get("sub") 
         if email is None:
             raise credentials_exception
@@ -55,8 +56,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire}) 
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)  
-    return encoded_jwt
+    return get_token_service().encode(to_encode)
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(new_user: UserCreate, db: AsyncSession = Depends(get_db)):
@@ -108,7 +108,7 @@ async def read_users_me(
 @router.get("/verify-email")
 async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]) 
+        payload = get_token_service().decode(token) 
         email: str = payload.get("sub")
         if not email:
             raise HTTPException(status_code=400, detail="Invalid token")
@@ -5,12 +5,34 @@ class Settings(BaseSettings):
     database_url: str
     sync_database_url: str
     async_database_url: str
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_prepared_statement_cache_size: int = 256
+    db_statement_cache_size: int = 256
+    db_warmup_connections: int = 5
+
+    # Репліки для читання (async URL-и через кому); порожньо — усе читання з primary
+    replica_database_urls: str = ""
+    replica_max_lag_seconds: float = 2
+    replica_check_interval_seconds: float = 5
+    # Скільки секунд після запису читання користувача йдуть на primary;
+    # має бути більшим за replica_max_lag_seconds
+    read_your_writes_seconds: float = 5
 
     # JWT
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
 
+    # Password hashing
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int = 8
+
     # Email
     mail_server: str
     mail_port: int
@@ -19,14 +41,76 @@ class Settings(BaseSettings):
     mail_from: str
     mail_starttls: bool
     mail_ssl_tls: bool
+    mail_pool_size: int = 2
+    mail_batch_size: int = 20
+    mail_max_attempts: int = 5
+    mail_retry_base_seconds: float = 30
+    # Скільки живе серцебиття воркера пошти; після цього його листи в обробці
+    # повертаються в чергу іншими воркерами
+    mail_worker_heartbeat_seconds: float = 30
 
     # Cloudinary
     cloud_name: str
     cloud_api_key: str
     cloud_api_secret: str
 
+    # Avatars
+    avatar_storage: str = "cloudinary"
+    avatar_local_dir: str = "static/avatars"
+    avatar_base_url: str = "/static/avatars"
+    avatar_max_bytes: int = 5 * 1024 * 1024
+    avatar_workers: int = 4
+
+    # Contacts import
+    import_batch_size: int = 1000
+    import_max_errors: int = 1000
+    # Найдовший рядок JSONL або запис CSV (разом з переносами в лапках), у символах
+    import_max_record_chars: int = 64 * 1024
+
     # Redis
     redis_url: str
+    redis_max_connections: int = 50
+    redis_pool_timeout: int = 5
+    redis_socket_timeout: float = 5
+    redis_health_check_interval: int = 30
+    redis_warmup_connections: int = 5
+
+    # Response cache
+    response_cache_enabled: bool = True
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_size: int = 2048
+
+    # Маршрути зі швидкою серіалізацією (кортежі рядків + orjson), через кому; "*" — усі.
+    # Вмикаються окремо: швидкий шлях не перевіряє рядки схемою ContactResponse.
+    fast_json_routes: str = ""
+
+    # Rate limiting (політики — app/src/services/rate_limit.py)
+    rate_limit_enabled: bool = True
+    rate_limit_local_max_keys: int = 10000
+    rate_limit_trust_forwarded: bool = False
+
+    # Instrumentation: Server-Timing у відповідях і поріг повторів SQL для попередження про N+1 (0 — вимкнено)
+    server_timing_enabled: bool = True
+    n_plus_one_threshold: int = 5
+
+    # Адміністратори (email-и через кому): доступ до /admin/profiler і профілювання запитів
+    admin_emails: str = ""
+
+    # Семплювальний профайлер
+    profiler_interval_ms: float = 5
+    profiler_request_interval_ms: float = 1
+    profiler_max_seconds: int = 60
+
+    # Моніторинг блокувань циклу подій
+    loop_lag_monitor_enabled: bool = True
+    loop_lag_threshold_ms: float = 100
+
+    # Lifespan
+    shutdown_grace_seconds: float = 10
+
+    # User cache
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_size: int = 1024
 
     # CORS
     allowed_origins: str
@@ -38,10 +122,15 @@ class Settings(BaseSettings):
     mail_test_recipient: str = "test@example.com" 
     jwt_algorithm: str = "HS256"
     jwt_expire_hours: int = 24 
+    token_cache_size: int = 4096
+    token_cache_ttl_seconds: int = 300
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"        
         extra = "ignore"
 
+# Створюється під час імпорту (близько 2 мс): engine, пули й middleware
+# читають налаштування на рівні модулів, а помилка конфігурації має
+# зупиняти старт воркера, а не перший запит.
 settings = Settings()
\ No newline at end of file
@@ -1,29 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from app.src.database import models 
-from datetime import date, timedelta
+from app.src.services import birthdays, search
 
-async def search_contacts(db: AsyncSession, query: str):     
-    result = await db.execute(  
-        select(models.Contact).where(
-            or_(     
-                models.Contact.first_name.ilike(f"%{query}%"),
-                models.Contact.last_name.ilike(f"%{query}%"),
-                models.Contact.email.ilike(f"%{query}%")     
-            )
-        )
-    )  
-    return result.scalars().all()
+async def search_contacts(db: AsyncSession, query: str, user_id: int, prefix: bool = False, limit: int = 20):     
+    return await search.search_contacts(db, query, user_id, prefix=prefix, limit=limit)
 
-async def upcoming_birthdays(db: AsyncSession):
-    today = date.today()      
-    upcoming_date = today + timedelta(days=7)   
-    result = await db.execute(       
-        select(models.Contact).where(   
-            func.to_char(models.Contact.birthday, 'MM-DD').between(
-                today.strftime('%m-%d'),     
-                upcoming_date.strftime('%m-%d')
-            ) 
-        ) 
-    ) 
-    return result.scalars().all()     
+async def upcoming_birthdays(db: AsyncSession, user_id: int, days: int = 7):
+    return await birthdays.upcoming_birthdays(db, user_id, days=days)
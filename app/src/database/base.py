@@ -1,14 +1,121 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import time
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 from app.src.config.config import settings
+from app.src.monitoring.instrumentation import instrument_engine
+from app.src.monitoring.metrics import registry
 
 Base = declarative_base()
 
-engine = create_async_engine(
-    settings.async_database_url,
-    echo=True
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total",
+    "Кількість видач з'єднань з пулу"
+)
+pool_wait_seconds = registry.counter(
+    "db_pool_wait_seconds_total",
+    "Сумарний час очікування вільного з'єднання в пулі"
+)
+pool_connects = registry.counter(
+    "db_pool_connects_total",
+    "Кількість нових фізичних з'єднань з базою"
+)
+
+pool_connect_seconds = registry.histogram(
+    "db_pool_connect_seconds",
+    "Час встановлення нового фізичного з'єднання (TCP, TLS, автентифікація)",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+class _WaitTimedQueue(AsyncAdaptedQueue):
+    """Черга пулу, що рахує час очікування поверненого з'єднання."""
+
+    def get(self, block=True, timeout=None):
+        # Неблокуючий get — лише перевірка наявності вільного з'єднання.
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_wait_seconds.inc(time.perf_counter() - start)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул, що окремо рахує очікування вільного з'єднання (вичерпаний пул)
+    і встановлення нових з'єднань.
+    """
+
+    _queue_class = _WaitTimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        invoke_creator = self._invoke_creator
+
+        def timed_creator(connection_record):
+            start = time.perf_counter()
+            try:
+                return invoke_creator(connection_record)
+            finally:
+                pool_connect_seconds.observe(time.perf_counter() - start)
+
+        # Через _invoke_creator проходять і перші з'єднання, і перепідключення
+        # після recycle чи invalidate.
+        self._invoke_creator = timed_creator
+
+def create_engine(url: str | None = None, **overrides) -> AsyncEngine:
+    """
+    Створює async engine з параметрами пулу з налаштувань.
+
+    Для SQLite параметри пулу не застосовуються.
+    """
+    url = make_url(url or settings.async_database_url)
+    options = {"echo": settings.db_echo}
+
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+        }
+    options.update(overrides)
+
+    new_engine = create_async_engine(url, **options)
+
+    @event.listens_for(new_engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checkouts.inc()
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_connects.inc()
+
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+engine = create_engine()
+
+registry.gauge(
+    "db_pool_checked_out",
+    "Кількість з'єднань, виданих з пулу",
+    callback=lambda: getattr(engine.pool, "checkedout", lambda: 0)()
+)
+registry.gauge(
+    "db_pool_size",
+    "Поточний розмір пулу з'єднань",
+    callback=lambda: getattr(engine.pool, "size", lambda: 0)()
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -19,6 +126,40 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+async def warm_up_engine(connections: int | None = None) -> int:
+    """
+    Відкриває кілька з'єднань одночасно, щоб вони залишились у пулі
+    і перші запити після деплою не чекали на встановлення з'єднання.
+    """
+    if connections is None:
+        connections = settings.db_warmup_connections
+    if engine.dialect.name != "sqlite":
+        connections = min(connections, settings.db_pool_size)
+    connections = max(connections, 1)
+
+    async def _open():
+        conn = await engine.connect()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    # Усі з'єднання тримаються відкритими одночасно, інакше пул
+    # щоразу віддаватиме те саме з'єднання.
+    results = await asyncio.gather(*(_open() for _ in range(connections)), return_exceptions=True)
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return connections
+
+async def dispose_engine() -> None:
+    await engine.dispose()
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -1,15 +1,7 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine    
-from app.src.database.base import Base 
-from sqlalchemy.orm import sessionmaker 
-from dotenv import load_dotenv
-import os
-    
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-    
-engine = create_async_engine(DATABASE_URL, echo=True) 
-SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
-    
-async def get_db():   
-    async with SessionLocal() as session: 
-        yield session
+from app.src.database.base import Base, engine, AsyncSessionLocal, get_db
+
+# Зворотна сумісність: модулі, що імпортують SessionLocal звідси,
+# використовують той самий engine і пул, що й base.py.
+SessionLocal = AsyncSessionLocal
+
+__all__ = ["Base", "engine", "AsyncSessionLocal", "SessionLocal", "get_db"]
@@ -1,21 +1,50 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import date
+from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, Index
+from sqlalchemy.orm import deferred, relationship, validates
 from app.src.database.base import Base
 
+def birthday_key(value: date) -> int:
+    """Ключ дня народження у форматі MMDD (наприклад, 1231 для 31 грудня)."""
+    return value.month * 100 + value.day
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
-    password = Column(String)
+    # Хеш пароля не завантажується з User: його читає лише вхід (через
+    # UserCredentials). Доступ без undefer() у запиті кидає помилку, а не
+    # ліниво довантажує колонку (в AsyncSession це MissingGreenlet).
+    password = deferred(Column(String), raiseload=True)
     confirmed = Column(Boolean, default=False)
     avatar = Column(String, nullable=True)
-    contacts = relationship("Contact", back_populates="owner")  
+    # Зв'язки ніколи не завантажуються неявно: доступ без selectinload()
+    # у запиті кидає помилку замість прихованого N+1.
+    contacts = relationship("Contact", back_populates="owner", lazy="raise")
 
 class Contact(Base):  
     __tablename__ = "contacts"
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String)
-    email = Column(String, unique=True, index=True)
-    phone = Column(String)
+    first_name = Column(String)
+    last_name = Column(String)
+    email = Column(String)
+    phone_number = Column(String)
+    birthday = Column(Date, nullable=True)
+    birthday_mmdd = Column(Integer, nullable=True)
+    additional_info = Column(String, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"))  
-    owner = relationship("User", back_populates="contacts")  
\ No newline at end of file
+    owner = relationship("User", back_populates="contacts", lazy="raise")
+
+    # Усі запити до контактів обмежені user_id, тому кожен індекс
+    # починається з нього. Email унікальний у межах користувача.
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_email", "user_id", "email", unique=True),
+        Index("ix_contacts_user_id_last_name_first_name", "user_id", "last_name", "first_name"),
+        Index("ix_contacts_user_id_birthday", "user_id", "birthday"),
+        Index("ix_contacts_user_id_birthday_mmdd", "user_id", "birthday_mmdd"),
+    )
+
+    @validates("birthday")
+    def _sync_birthday_mmdd(self, key, value):
+        self.birthday_mmdd = birthday_key(value) if value is not None else None
+        return value
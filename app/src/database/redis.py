@@ -1,12 +1,138 @@
+import asyncio
+import time
 from redis import asyncio as redis
+from redis.asyncio.client import Pipeline
 from app.src.config.config import settings
+from app.src.monitoring.instrumentation import record_redis_command
+from app.src.monitoring.metrics import registry
 
-async def get_redis():
-    redis_connection = await redis.Redis.from_url(
-        settings.REDIS_URL,
+_pool: redis.BlockingConnectionPool | None = None
+_redis_client: redis.Redis | None = None
+
+redis_ping_latency = registry.gauge(
+    "redis_ping_latency_seconds",
+    "Затримка останнього PING до Redis"
+)
+redis_up = registry.gauge(
+    "redis_up",
+    "1, якщо останній PING до Redis був успішним"
+)
+
+class InstrumentedPipeline(Pipeline):
+    """Конвеєр, що вимірює execute() як одну команду PIPELINE."""
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            record_redis_command("PIPELINE", time.perf_counter() - start)
+
+class InstrumentedRedis(redis.Redis):
+    """Клієнт, що вимірює тривалість кожної команди Redis."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            command = args[0].decode() if isinstance(args[0], bytes) else str(args[0])
+            record_redis_command(command.upper(), time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+def create_redis_pool() -> redis.BlockingConnectionPool:
+    """
+    Пул з'єднань Redis на весь час життя застосунку.
+
+    BlockingConnectionPool чекає на вільне з'єднання до redis_pool_timeout
+    замість помилки, коли всі max_connections зайняті.
+    """
+    return redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=settings.redis_health_check_interval,
         decode_responses=True
     )
+
+def get_redis_client() -> redis.Redis:
+    """
+    Спільний клієнт Redis поверх пулу застосунку.
+
+    Зазвичай створюється в lifespan через init_redis(); скрипти та
+    воркери, що працюють без застосунку, отримують його ліниво.
+    """
+    global _pool, _redis_client
+    if _redis_client is None:
+        _pool = create_redis_pool()
+        _redis_client = InstrumentedRedis(connection_pool=_pool)
+    return _redis_client
+
+async def init_redis() -> redis.Redis:
+    client = get_redis_client()
+    await ping()
+    return client
+
+async def warm_up_redis(connections: int | None = None) -> int:
+    """
+    Відкриває кілька з'єднань пулу паралельними PING, щоб вони
+    залишились у пулі до першого запиту.
+    """
+    if connections is None:
+        connections = settings.redis_warmup_connections
+    connections = max(1, min(connections, settings.redis_max_connections))
+    client = get_redis_client()
+    await asyncio.gather(*(client.ping() for _ in range(connections)))
+    return connections
+
+async def close_redis() -> None:
+    global _pool, _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = None
+    _redis_client = None
+
+async def ping() -> float:
+    """Перевіряє Redis і повертає затримку PING у секундах."""
+    start = time.perf_counter()
     try:
-        yield redis_connection
-    finally:
-        await redis_connection.close()
\ No newline at end of file
+        await get_redis_client().ping()
+    except redis.RedisError:
+        redis_up.set(0)
+        raise
+    latency = time.perf_counter() - start
+    redis_ping_latency.set(latency)
+    redis_up.set(1)
+    return latency
+
+def pool_stats() -> dict:
+    if _pool is None:
+        return {"max_connections": settings.redis_max_connections, "in_use": 0, "idle": 0}
+    return {
+        "max_connections": _pool.max_connections,
+        "in_use": len(_pool._in_use_connections),
+        "idle": len(_pool._available_connections),
+    }
+
+registry.gauge(
+    "redis_pool_in_use",
+    "З'єднання Redis, видані з пулу",
+    callback=lambda: pool_stats()["in_use"]
+)
+registry.gauge(
+    "redis_pool_idle",
+    "Вільні з'єднання Redis у пулі",
+    callback=lambda: pool_stats()["idle"]
+)
+
+async def get_redis():
+    """Залежність FastAPI: спільний клієнт, з'єднання повертається в пул."""
+    yield get_redis_client()
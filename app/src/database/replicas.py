@@ -0,0 +1,218 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.src.config.config import settings
+from app.src.database.base import AsyncSessionLocal, create_engine
+from app.src.database.redis import get_redis_client
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+STICKY_PREFIX = "db:ryw:"
+
+# Відставання репліки PostgreSQL у секундах. Якщо все отримане вже
+# застосовано, репліка актуальна, навіть коли primary давно не писав
+# і pg_last_xact_replay_timestamp() старий.
+PG_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+replica_healthy = registry.gauge(
+    "db_replica_healthy",
+    "1, якщо репліка відповідає і відстає не більше replica_max_lag_seconds",
+    labelnames=("replica",),
+)
+replica_lag = registry.gauge(
+    "db_replica_lag_seconds",
+    "Відставання репліки за останньою перевіркою",
+    labelnames=("replica",),
+)
+read_routes = registry.counter(
+    "db_read_routes_total",
+    "Куди спрямовано сесії читання і чому",
+    labelnames=("target", "reason"),
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: sessionmaker
+    # None — ще не перевірялася.
+    healthy: Optional[bool] = None
+    lag: float = 0.0
+
+
+def _replica_name(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.host:
+        return f"{parsed.host}:{parsed.port or ''}/{parsed.database or ''}"
+    return parsed.database or url
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор сесій читання між primary і репліками.
+
+    Сесії читання отримують репліки по колу, але лише здорові: фонова
+    перевірка кожні check_interval секунд вимірює відставання (на SQLite —
+    просто SELECT 1), і репліка, що не відповідає або відстає більше за
+    max_lag, пропускається. Без здорових реплік читання йде на primary.
+
+    Read-your-writes: після запису користувача (mark_write) його читання
+    sticky_seconds секунд ідуть на primary. Позначка зберігається локально
+    і в Redis, щоб її бачили всі воркери. Записи завжди йдуть на primary
+    через get_db().
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, sticky_seconds: float, check_interval: float):
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self.replicas: List[Replica] = []
+        for url in urls:
+            engine = create_engine(url)
+            self.replicas.append(Replica(
+                name=_replica_name(url),
+                engine=engine,
+                session_factory=sessionmaker(
+                    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                ),
+            ))
+        self._cycle = itertools.count()
+        self._recent_writes: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _lag(self, conn: AsyncConnection) -> float:
+        """Відставання репліки в секундах; SQLite лише відповідає на SELECT 1."""
+        if conn.dialect.name == "postgresql":
+            return float(await asyncio.wait_for(conn.scalar(text(PG_LAG_SQL)), self.check_interval))
+        await asyncio.wait_for(conn.execute(text("SELECT 1")), self.check_interval)
+        return 0.0
+
+    async def _check(self, replica: Replica) -> None:
+        was_healthy = replica.healthy
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await self._lag(conn)
+        except Exception as e:
+            replica.healthy = False
+            if was_healthy is not False:
+                logger.warning(f"Replica {replica.name} is unavailable: {str(e)}")
+        else:
+            replica.lag = lag
+            replica.healthy = lag <= self.max_lag
+            if was_healthy and not replica.healthy:
+                logger.warning(f"Replica {replica.name} lags {lag:.1f}s, reads fall back")
+        replica_healthy.set(int(replica.healthy), replica=replica.name)
+        replica_lag.set(replica.lag, replica=replica.name)
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _run_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        """Перша перевірка реплік і запуск фонових перевірок."""
+        if not self.replicas:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run_checks())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def pick(self) -> Optional[Replica]:
+        """Наступна здорова репліка по колу або None."""
+        count = len(self.replicas)
+        start = next(self._cycle)
+        for offset in range(count):
+            replica = self.replicas[(start + offset) % count]
+            if replica.healthy:
+                return replica
+        return None
+
+    async def mark_write(self, user_id: int) -> None:
+        """Направляє читання користувача на primary на sticky_seconds. Викликати після commit."""
+        if not self.replicas:
+            return
+        now = time.monotonic()
+        self._recent_writes[user_id] = now + self.sticky_seconds
+        if len(self._recent_writes) > 10000:
+            self._recent_writes = {
+                uid: until for uid, until in self._recent_writes.items() if until > now
+            }
+        try:
+            await get_redis_client().set(
+                f"{STICKY_PREFIX}{user_id}", 1, px=int(self.sticky_seconds * 1000)
+            )
+        except RedisError as e:
+            logger.warning(f"Read-your-writes mark failed: {str(e)}")
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        until = self._recent_writes.get(user_id)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            self._recent_writes.pop(user_id, None)
+        try:
+            return bool(await get_redis_client().exists(f"{STICKY_PREFIX}{user_id}"))
+        except RedisError as e:
+            # Без Redis не відомо, чи був запис в іншому воркері: читаємо з primary.
+            logger.warning(f"Read-your-writes check failed: {str(e)}")
+            return True
+
+    async def read_session_factory(self, user_id: Optional[int] = None) -> sessionmaker:
+        """Фабрика сесій для читання даних користувача: репліка або primary."""
+        if not self.replicas:
+            return AsyncSessionLocal
+        if user_id is not None and await self.wrote_recently(user_id):
+            read_routes.inc(target="primary", reason="recent_write")
+            return AsyncSessionLocal
+        replica = self.pick()
+        if replica is None:
+            read_routes.inc(target="primary", reason="no_healthy_replica")
+            return AsyncSessionLocal
+        read_routes.inc(target="replica", reason="round_robin")
+        return replica.session_factory
+
+    @asynccontextmanager
+    async def read_session(self, user_id: Optional[int] = None) -> AsyncIterator[AsyncSession]:
+        session_factory = await self.read_session_factory(user_id)
+        async with session_factory() as session:
+            yield session
+
+
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in settings.replica_database_urls.split(",") if url.strip()],
+    max_lag=settings.replica_max_lag_seconds,
+    sticky_seconds=settings.read_your_writes_seconds,
+    check_interval=settings.replica_check_interval_seconds,
+)
@@ -0,0 +1,175 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Тривалість обробки HTTP-запитів за шаблонами маршрутів",
+    labelnames=("method", "route", "status"),
+)
+request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "Кількість SQL-запитів на один HTTP-запит",
+    labelnames=("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Тривалість виконання SQL-запитів",
+    labelnames=("operation",),
+    buckets=QUERY_BUCKETS,
+)
+redis_command_duration = registry.histogram(
+    "redis_command_duration_seconds",
+    "Тривалість команд і конвеєрів Redis",
+    labelnames=("command",),
+    buckets=QUERY_BUCKETS,
+)
+n_plus_one_requests = registry.counter(
+    "db_n_plus_one_requests_total",
+    "HTTP-запити, в яких той самий SQL виконувався n_plus_one_threshold разів або більше",
+    labelnames=("route",),
+)
+
+
+@dataclass
+class RequestStats:
+    """Звернення до бази та Redis у межах одного HTTP-запиту."""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    redis_commands: int = 0
+    redis_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Статистика поточного запиту або None поза обробкою запиту."""
+    return _current.get()
+
+
+def _operation(statement: str) -> str:
+    verb = statement.lstrip()[:6].upper()
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Вимірює кожен SQL-запит через before/after_cursor_execute.
+
+    Для async engine передається engine.sync_engine. Хуки виконуються в
+    greenlet-і SQLAlchemy з контекстом задачі запиту, тож бачать його
+    RequestStats.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        db_query_duration.observe(elapsed, operation=_operation(statement))
+        stats = _current.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] += 1
+
+
+def record_redis_command(command: str, elapsed: float) -> None:
+    redis_command_duration.observe(elapsed, command=command)
+    stats = _current.get()
+    if stats is not None:
+        stats.redis_commands += 1
+        stats.redis_seconds += elapsed
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    """Значення заголовка Server-Timing: загальний час, база і Redis у мілісекундах."""
+    return (
+        f"app;dur={elapsed * 1000:.2f}, "
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_queries} queries", '
+        f'redis;dur={stats.redis_seconds * 1000:.2f};desc="{stats.redis_commands} commands"'
+    )
+
+
+def _route_template(scope: Scope) -> str:
+    # FastAPI кладе знайдений маршрут у scope; шаблон шляху замість
+    # фактичного тримає кількість серій метрик обмеженою.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI-проміжний шар вимірювань.
+
+    Для кожного HTTP-запиту записує гістограму тривалості за шаблоном
+    маршруту, кількість SQL-запитів, додає заголовок Server-Timing і
+    попереджає про ймовірний N+1, коли той самий SQL виконується
+    n_plus_one_threshold разів або більше (0 вимикає перевірку).
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = _route_template(scope)
+            request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"], route=route, status=str(status_code)
+            )
+            request_db_queries.observe(stats.db_queries, route=route)
+            self._check_n_plus_one(route, stats)
+
+    def _check_n_plus_one(self, route: str, stats: RequestStats) -> None:
+        if not self.n_plus_one_threshold or not stats.statements:
+            return
+        statement, count = stats.statements.most_common(1)[0]
+        if count >= self.n_plus_one_threshold:
+            n_plus_one_requests.inc(route=route)
+            logger.warning(
+                f"Possible N+1 on {route}: same statement executed {count} times "
+                f"({stats.db_queries} queries total): {' '.join(statement.split())[:200]}"
+            )
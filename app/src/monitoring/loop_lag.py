@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "Наскільки пізніше запланованого прокидається цикл подій",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+loop_blocked = registry.counter(
+    "event_loop_blocked_total",
+    "Випадки, коли цикл подій був заблокований довше loop_lag_threshold_ms",
+)
+
+
+class LoopLagMonitor:
+    """
+    Моніторинг блокувань циклу подій.
+
+    Корутина-пульс прокидається кожні interval секунд і записує запізнення
+    в гістограму. Потік-сторож стежить за часом останнього пульсу: якщо
+    цикл не відповідає довше threshold, він логує поточний стек потоку
+    циклу — тобто синхронний код, що його блокує (bcrypt, smtplib,
+    cloudinary тощо). Кожне блокування логується один раз.
+    """
+
+    def __init__(self, threshold: float, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            loop_lag.observe(lag)
+            if lag >= self.threshold:
+                loop_blocked.inc()
+            self._beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable\n"
+            logger.warning(
+                f"Event loop blocked for over {blocked * 1000:.0f} ms, loop thread stack:\n{stack}"
+            )
@@ -0,0 +1,224 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.src.monitoring.metrics import registry
+
+profiles_taken = registry.counter(
+    "profiler_profiles_total",
+    "Зняті профілі за типом: сесія або окремий запит",
+    labelnames=("kind",),
+)
+
+_CWD = os.getcwd() + os.sep
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.rsplit(marker, 1)[1]
+    if filename.startswith(_CWD):
+        return filename[len(_CWD):]
+    return os.path.basename(filename)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    # ";" розділяє кадри у форматі collapsed stacks.
+    return f"{name} ({_short_path(code.co_filename)})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Семплювальний профайлер на sys._current_frames().
+
+    Окремий потік кожні interval секунд знімає стеки потоків і рахує
+    однакові. Профільований код не інструментується, тож накладні
+    витрати обмежені знімком стеків під GIL. Результат — collapsed
+    stacks ("потік;кадр;...;кадр кількість"), які приймають
+    flamegraph.pl, speedscope та inferno.
+    """
+
+    def __init__(self, interval: float, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def start(self, duration: Optional[float] = None) -> None:
+        """Запускає семплювання; з duration воно зупиняється саме."""
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, args=(duration,), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, duration: Optional[float]) -> None:
+        own_id = threading.get_ident()
+        deadline = self.started_at + duration if duration else None
+        names = {}
+        while not self._stop.wait(self.interval):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+        self.finished_at = time.monotonic()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+class ProfilerBusy(Exception):
+    """Профайлер уже працює: одночасно допускається лише один профіль."""
+
+
+_lock = threading.Lock()
+_active: Optional[SamplingProfiler] = None
+_session: Optional[SamplingProfiler] = None
+
+
+def _acquire(profiler: SamplingProfiler) -> None:
+    global _active
+    with _lock:
+        if _active is not None and _active.running:
+            raise ProfilerBusy()
+        _active = profiler
+
+
+def start_session(seconds: float, interval: float) -> SamplingProfiler:
+    """
+    Починає профілювання всіх потоків на seconds секунд.
+
+    Raises:
+        ProfilerBusy: якщо вже триває інший профіль
+    """
+    global _session
+    profiler = SamplingProfiler(interval)
+    _acquire(profiler)
+    profiler.start(seconds)
+    _session = profiler
+    profiles_taken.inc(kind="session")
+    return profiler
+
+
+def stop_session() -> Optional[SamplingProfiler]:
+    """Зупиняє поточну сесію і повертає її (або останню завершену)."""
+    if _session is not None:
+        _session.stop()
+    return _session
+
+
+def current_session() -> Optional[SamplingProfiler]:
+    return _session
+
+
+def _bearer_is_admin(scope: Scope) -> bool:
+    from app.src.services.auth import is_admin
+    from app.src.services.tokens import PyJWTError, get_token_service
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return False
+            try:
+                return is_admin(get_token_service().decode(token).get("sub"))
+            except PyJWTError:
+                return False
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Профілювання окремого запиту адміністратора.
+
+    Якщо запит має заголовок X-Profile і токен адміністратора, потік
+    циклу подій семплюється на час обробки, а замість відповіді
+    повертаються collapsed stacks; початковий статус — у X-Profiled-Status.
+    Семплюється весь цикл подій, тож у профіль потрапляють і
+    конкурентні запити. Інші запити проходять без змін.
+    """
+
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not any(name == b"x-profile" for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        if not _bearer_is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(self.interval, thread_ids=[threading.get_ident()])
+        try:
+            _acquire(profiler)
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+        profiles_taken.inc(kind="request")
+
+        body = profiler.collapsed().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(status_code).encode()),
+                (b"x-profile-samples", str(profiler.samples).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,10 +1,340 @@
+import base64
+import json
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.src.database.models import Contact, User
-from typing import Optional
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from app.src.database.models import Contact, User, birthday_key
+from app.src.schemas import (
+    ContactBatchCreate,
+    ContactBatchDelete,
+    ContactBatchOperation,
+    ContactCreate,
+    ContactUpdate,
+)
+from app.src.services import birthdays, search
+from app.src.database.replicas import replica_router
+from app.src.services.response_cache import response_cache
+from app.src.repository.read_models import ContactRow, fetch_one, select_model, to_models
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-async def get_contact(db: AsyncSession, contact_id: int, user: User) -> Optional[Contact]:
+# Ключі сортування для курсорної пагінації. Кожен ключ однозначно задає
+# порядок у межах користувача, а (user_id, ...ключ) покривається індексом.
+SORT_KEYS = {
+    "id": (Contact.id,),
+    "email": (Contact.email,),
+    "name": (Contact.last_name, Contact.first_name, Contact.id),
+    "birthday": (Contact.birthday, Contact.id),
+}
+
+# Значення, які JSON зберігає рядками, відновлюються за типом колонки.
+_CURSOR_TYPES = {date: date.fromisoformat}
+
+def encode_cursor(sort: str, contact: Contact) -> str:
+    """Кодує позицію останнього контакту сторінки в непрозорий курсор."""
+    payload = [sort, *(getattr(contact, column.key) for column in SORT_KEYS[sort])]
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    """
+    Розкодовує курсор у значення ключа сортування.
+
+    Raises:
+        ValueError: якщо курсор пошкоджений або створений для іншого сортування
+    """
+    columns = SORT_KEYS[sort]
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, *values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    if len(values) != len(columns):
+        raise ValueError("Malformed cursor")
+    try:
+        return tuple(
+            value if value is None else _CURSOR_TYPES.get(column.type.python_type, column.type.python_type)(value)
+            for column, value in zip(columns, values)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+
+async def get_contacts(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    read_model: Optional[type] = None
+) -> List[Contact]:
+    """
+    Повертає сторінку контактів користувача.
+
+    Якщо skip > 0, використовується застаріла OFFSET-пагінація,
+    інакше — keyset-пагінація від позиції курсору. З read_model
+    повертаються її кортежі замість ORM-об'єктів.
+
+    Сортування за birthday пропускає контакти без дня народження: NULL
+    не порівнюється в keyset-умові, а PostgreSQL і SQLite ставлять його
+    в різні кінці порядку, тож такі рядки губилися б між сторінками.
+    """
+    columns = SORT_KEYS[sort]
+    stmt = select_model(read_model) if read_model else select(Contact)
+    stmt = stmt.where(Contact.user_id == user_id)
+
+    if skip:
+        stmt = stmt.order_by(Contact.id).offset(skip)
+    else:
+        if sort == "birthday":
+            stmt = stmt.where(Contact.birthday.isnot(None))
+        if cursor is not None:
+            values = decode_cursor(cursor, sort)
+            if len(columns) == 1:
+                stmt = stmt.where(columns[0] > values[0])
+            else:
+                stmt = stmt.where(tuple_(*columns) > tuple_(*values))
+        stmt = stmt.order_by(*columns)
+
+    result = await db.execute(stmt.limit(limit))
+    return to_models(read_model, result.all()) if read_model else result.scalars().all()
+
+def next_cursor(contacts: List[Contact], limit: int, sort: str = "id") -> Optional[str]:
+    """Курсор наступної сторінки або None, якщо сторінка остання."""
+    if len(contacts) < limit:
+        return None
+    return encode_cursor(sort, contacts[-1])
+
+async def get_contact(
+    db: AsyncSession,
+    contact_id: int,
+    user: User,
+    read_model: Optional[type] = None
+) -> Optional[Contact]:
+    if read_model is not None:
+        return await fetch_one(
+            db, read_model,
+            select_model(read_model).where(Contact.id == contact_id, Contact.user_id == user.id)
+        )
     result = await db.execute(
         select(Contact).filter_by(id=contact_id, user_id=user.id)
     )
-    return result.scalars().first()
\ No newline at end of file
+    return result.scalars().first()
+
+
+async def _get_owned(db: AsyncSession, contact_id: int, user_id: int) -> Optional[Contact]:
+    result = await db.execute(
+        select(Contact).where(Contact.id == contact_id, Contact.user_id == user_id)
+    )
+    return result.scalars().first()
+
+async def _commit(db: AsyncSession) -> None:
+    """Фіксує транзакцію; IntegrityError (email уже зайнятий) відкочує її і пробрасується."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+
+async def _after_write(user_id: int) -> None:
+    """
+    Закріплює читання користувача за primary і скидає його кеші.
+
+    Порядок важливий: поки позначки запису немає, паралельний запит може
+    прочитати репліку, що ще не отримала зміну, і знову заповнити щойно
+    скинутий кеш старими даними.
+    """
+    await replica_router.mark_write(user_id)
+    await birthdays.invalidate(user_id)
+    await response_cache.bump(user_id)
+
+async def create_contact(db: AsyncSession, contact: ContactCreate, user_id: int) -> Contact:
+    db_contact = Contact(**contact_row(contact, user_id))
+    db.add(db_contact)
+    await _commit(db)
+    await db.refresh(db_contact)
+    await _after_write(user_id)
+    return db_contact
+
+async def update_contact(
+    db: AsyncSession,
+    contact_id: int,
+    contact: ContactUpdate,
+    user_id: int
+) -> Optional[Contact]:
+    db_contact = await _get_owned(db, contact_id, user_id)
+    if db_contact is None:
+        return None
+    apply_contact_update(db_contact, contact)
+    await _commit(db)
+    await db.refresh(db_contact)
+    await _after_write(user_id)
+    return db_contact
+
+async def delete_contact(db: AsyncSession, contact_id: int, user_id: int) -> Optional[Contact]:
+    db_contact = await _get_owned(db, contact_id, user_id)
+    if db_contact is None:
+        return None
+    await db.delete(db_contact)
+    await db.commit()
+    await _after_write(user_id)
+    return db_contact
+
+async def search_contacts(
+    db: AsyncSession,
+    query: str,
+    user_id: int,
+    prefix: bool = False,
+    limit: int = 20,
+    read_model: Optional[type] = None
+) -> List[Contact]:
+    """Ранжований пошук серед контактів користувача."""
+    return await search.search_contacts(
+        db, query, user_id, prefix=prefix, limit=limit, read_model=read_model
+    )
+
+async def upcoming_birthdays(db: AsyncSession, user_id: int, days: int = 7) -> List[ContactRow]:
+    """Контакти з днем народження в найближчі days днів."""
+    return await birthdays.upcoming_birthdays(db, user_id, days=days)
+
+def contact_row(contact: ContactCreate, user_id: int) -> Dict[str, Any]:
+    """
+    Значення колонок таблиці contacts для схеми ContactCreate.
+
+    Використовується там, де рядки пишуться Core-запитами в обхід ORM.
+    """
+    return {
+        **contact.model_dump(),
+        "birthday_mmdd": birthday_key(contact.birthday),
+        "user_id": user_id,
+    }
+
+# Колонки, що оновлюються, коли імпортований контакт уже існує.
+UPSERT_COLUMNS = (
+    "first_name", "last_name", "phone_number", "birthday", "birthday_mmdd", "additional_info"
+)
+
+def _insert_for(db: AsyncSession):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+async def upsert_contacts(
+    db: AsyncSession,
+    contacts: Sequence[ContactCreate],
+    user_id: int
+) -> List[str]:
+    """
+    Вставляє або оновлює контакти одним багаторядковим
+    INSERT ... ON CONFLICT (user_id, email).
+
+    Транзакцію фіксує викликач. Повертає email-и записаних рядків.
+    """
+    if not contacts:
+        return []
+
+    insert = _insert_for(db)
+    stmt = insert(Contact).values([contact_row(c, user_id) for c in contacts])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Contact.user_id, Contact.email],
+        set_={
+            column: stmt.excluded[column]
+            for column in UPSERT_COLUMNS
+        }
+    ).returning(Contact.email)
+
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+async def invalidate_user_caches(user_id: int) -> None:
+    """
+    Скидає похідні кеші користувача після масових змін, що оминають ORM-події.
+    """
+    search.invalidate_index(user_id)
+    await _after_write(user_id)
+
+def apply_contact_update(contact: Contact, data: ContactUpdate) -> None:
+    """Переносить задані поля ContactUpdate на ORM-об'єкт контакту."""
+    for key, value in data.model_dump(exclude_unset=True).items():
+        setattr(contact, key, value)
+
+async def apply_batch(
+    db: AsyncSession,
+    operations: Sequence[ContactBatchOperation],
+    user_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Виконує змішаний пакет create/update/delete в одній транзакції.
+
+    Створення — один INSERT ... ON CONFLICT DO NOTHING, оновлення — один
+    SELECT і спільний flush, видалення — один DELETE. Повертає результати
+    в порядку операцій. IntegrityError (наприклад, зайнятий email при
+    оновленні) відкочує весь пакет і пробрасується викликачу.
+    """
+    results: List[Dict[str, Any]] = [None] * len(operations)
+    creates = [(i, op) for i, op in enumerate(operations) if isinstance(op, ContactBatchCreate)]
+    deletes = [(i, op) for i, op in enumerate(operations) if isinstance(op, ContactBatchDelete)]
+    updates = [
+        (i, op) for i, op in enumerate(operations)
+        if not isinstance(op, (ContactBatchCreate, ContactBatchDelete))
+    ]
+
+    try:
+        target_ids = {op.id for _, op in updates + deletes}
+        owned: Dict[int, Contact] = {}
+        if target_ids:
+            result = await db.execute(
+                select(Contact).where(Contact.user_id == user_id, Contact.id.in_(target_ids))
+            )
+            owned = {contact.id: contact for contact in result.scalars().all()}
+
+        for i, op in updates:
+            contact = owned.get(op.id)
+            if contact is None:
+                results[i] = {"index": i, "op": "update", "status": "not_found", "id": op.id}
+                continue
+            apply_contact_update(contact, op.data)
+            results[i] = {"index": i, "op": "update", "status": "updated", "id": op.id}
+        await db.flush()
+
+        if creates:
+            insert = _insert_for(db)
+            stmt = (
+                insert(Contact)
+                .values([contact_row(op.data, user_id) for _, op in creates])
+                .on_conflict_do_nothing(index_elements=[Contact.user_id, Contact.email])
+                .returning(Contact.id, Contact.email)
+            )
+            created = {email: contact_id for contact_id, email in (await db.execute(stmt)).all()}
+            for i, op in creates:
+                contact_id = created.pop(op.data.email, None)
+                if contact_id is None:
+                    results[i] = {
+                        "index": i, "op": "create", "status": "conflict",
+                        "detail": "A contact with this email already exists"
+                    }
+                else:
+                    results[i] = {"index": i, "op": "create", "status": "created", "id": contact_id}
+
+        delete_ids = {op.id for _, op in deletes if op.id in owned}
+        if delete_ids:
+            await db.execute(
+                delete(Contact)
+                .where(Contact.user_id == user_id, Contact.id.in_(delete_ids))
+                .execution_options(synchronize_session="fetch")
+            )
+        for i, op in deletes:
+            status = "deleted" if op.id in delete_ids else "not_found"
+            results[i] = {"index": i, "op": "delete", "status": status, "id": op.id}
+
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    await invalidate_user_caches(user_id)
+    return results
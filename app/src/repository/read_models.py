@@ -0,0 +1,67 @@
+"""
+Легкі моделі читання: лише колонки, потрібні ендпоінту, у NamedTuple.
+
+Такі запити не створюють ORM-об'єктів у identity map сесії і не можуть
+викликати ліниве завантаження зв'язків. Колонки кожної моделі задані
+в __columns__ у тому ж порядку, що й поля кортежу.
+"""
+from datetime import date
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.database.models import Contact, User
+
+T = TypeVar("T", bound=tuple)
+
+
+class ContactRow(NamedTuple):
+    """Поля ContactResponse."""
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+    # NULL у рядках, створених до появи колонки (міграція d4e8b2c6f1a9).
+    birthday: Optional[date]
+    additional_info: Optional[str]
+
+    __columns__ = (
+        Contact.id,
+        Contact.first_name,
+        Contact.last_name,
+        Contact.email,
+        Contact.phone_number,
+        Contact.birthday,
+        Contact.additional_info,
+    )
+
+
+class UserCredentials(NamedTuple):
+    """Дані для входу: без зв'язків і без об'єкта User у сесії."""
+    id: int
+    email: str
+    password: str
+    confirmed: bool
+    avatar: Optional[str]
+
+    __columns__ = (User.id, User.email, User.password, User.confirmed, User.avatar)
+
+
+def select_model(model: Type[Any]) -> Select:
+    return select(*model.__columns__)
+
+
+def to_models(model: Type[T], rows: Iterable[Sequence[Any]]) -> List[T]:
+    return [model._make(row) for row in rows]
+
+
+async def fetch_all(db: AsyncSession, model: Type[T], stmt: Select) -> List[T]:
+    result = await db.execute(stmt)
+    return to_models(model, result.all())
+
+
+async def fetch_one(db: AsyncSession, model: Type[T], stmt: Select) -> Optional[T]:
+    row = (await db.execute(stmt.limit(1))).first()
+    return model._make(row) if row is not None else None
@@ -1,34 +1,45 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
-from passlib.context import CryptContext
 from app.src.database.models import User  
 from app.src.schemas.users import UserCreate
 from app.src.services.email import send_verification_email
-from app.src.services.auth import create_access_token
+from app.src.services.auth import create_access_token, get_password_hash
+from app.src.services.user_cache import user_cache
 from datetime import timedelta
 from fastapi import HTTPException
 import logging
 from sqlalchemy import select
 from app.src.database.models import User
+from app.src.repository.read_models import UserCredentials, fetch_one, select_model
 from typing import Optional
 
 logger = logging.getLogger(__name__)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 async def get_user_by_email(email: str, db: AsyncSession) -> User | None:
     result = await db.execute(select(User).where(User.email == email))
     return result.scalars().first()
 
+async def get_user_credentials(email: str, db: AsyncSession) -> Optional[UserCredentials]:
+    """Дані для перевірки пароля без завантаження User у сесію."""
+    return await fetch_one(db, UserCredentials, select_model(UserCredentials).where(User.email == email))
+
+async def email_exists(email: str, db: AsyncSession) -> bool:
+    result = await db.execute(select(User.id).where(User.email == email).limit(1))
+    return result.first() is not None
+
+async def update_password_hash(user_id: int, password_hash: str, db: AsyncSession) -> None:
+    await db.execute(update(User).where(User.id == user_id).values(password=password_hash))
+    await db.commit()
+
 async def create_user(user: UserCreate, db: AsyncSession) -> User:
-    existing_user = await get_user_by_email(user.email, db)
-    if existing_user:
+    if await email_exists(user.email, db):
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
 
-    hashed_password = pwd_context.hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     db_user = User(email=user.email, password=hashed_password)
     db.add(db_user)
     await db.commit()
@@ -48,9 +59,10 @@ async def create_user(user: UserCreate, db: AsyncSession) -> User:
     return db_user  
 
 async def update_user_avatar(user_id: int, avatar_url: str, db: AsyncSession) -> User:
+    # UPDATE виконується лише якщо URL справді змінився
     stmt = (
         update(User)
-        .where(User.id == user_id)
+        .where(User.id == user_id, User.avatar.is_distinct_from(avatar_url))
         .values(avatar=avatar_url)
         .returning(User)
     )
@@ -58,13 +70,17 @@ async def update_user_avatar(user_id: int, avatar_url: str, db: AsyncSession) ->
     await db.commit()
     updated_user = result.scalars().first()
     
-    if not updated_user:
+    if updated_user:
+        await user_cache.invalidate(updated_user.email)
+        return updated_user
+
+    user = await get_user_by_id(user_id, db)
+    if not user:
         raise HTTPException(
             status_code=404,
             detail="User not found"
         )
-    
-    return updated_user
+    return user
 
 async def update_avatar(self, email: str, url: str):
     user = await self.get_user_by_email(email)
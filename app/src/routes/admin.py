@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.src.config.config import settings
+from app.src.monitoring import profiling
+from app.src.services.auth import get_current_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_admin)]
+)
+
+def _session_status(profiler: profiling.SamplingProfiler) -> dict:
+    return {
+        "running": profiler.running,
+        "samples": profiler.samples,
+        "elapsed_seconds": round(profiler.elapsed, 3),
+        "interval_ms": profiler.interval * 1000
+    }
+
+@router.post(
+    "/profiler/start",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start the sampling profiler",
+    description=(
+        "Samples the stacks of all worker threads for the given number of seconds. "
+        "Collect the result with POST /admin/profiler/stop."
+    )
+)
+async def start_profiler(
+    seconds: float = Query(10, gt=0, le=settings.profiler_max_seconds)
+):
+    try:
+        profiler = profiling.start_session(seconds, settings.profiler_interval_ms / 1000)
+    except profiling.ProfilerBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already being recorded"
+        )
+    return {**_session_status(profiler), "seconds": seconds}
+
+@router.get(
+    "/profiler",
+    summary="Profiler status",
+    description="Reports whether a profiling session is running and how many samples it has."
+)
+async def profiler_status():
+    profiler = profiling.current_session()
+    if profiler is None:
+        return {"running": False, "samples": 0}
+    return _session_status(profiler)
+
+@router.post(
+    "/profiler/stop",
+    response_class=PlainTextResponse,
+    summary="Stop the profiler and get collapsed stacks",
+    description=(
+        "Stops the current session (or returns the last finished one) as collapsed stacks, "
+        "ready for flamegraph.pl, speedscope or inferno."
+    )
+)
+async def stop_profiler():
+    profiler = profiling.stop_session()
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="No profiling session has been started")
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Seconds": f"{profiler.elapsed:.3f}"
+        }
+    )
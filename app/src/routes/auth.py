@@ -3,24 +3,30 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File,
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_limiter.depends import RateLimiter
 from sqlalchemy.ext.asyncio import AsyncSession
-import jwt
-from jwt.exceptions import PyJWTError as JWTError
+from app.src.services.tokens import ExpiredSignatureError, InvalidTokenError, get_token_service
 import logging
-from app.src.schemas.users import UserResponse, UserCreate, UserEmailSchema, ResetPasswordSchema
+from app.src.schemas.users import UserResponse, UserCreate, UserEmailSchema, ResetPasswordSchema, AvatarStatusResponse
 from app.src.services.auth import (
     create_access_token,
-    verify_password,
     get_password_hash,
     get_current_user,
     reset_user_password
 )
-from app.src.repository.users import get_user_by_email, update_user_avatar, get_user_by_id
+from app.src.repository.users import (
+    email_exists,
+    get_user_by_id,
+    get_user_credentials,
+    update_password_hash
+)
 from app.src.services.email import send_verification_email, send_password_reset_email, create_password_reset_token
-from app.src.services.cloudinary_service import upload_avatar 
+from app.src.services.avatars import schedule_avatar_update, get_status as get_avatar_status
 from app.src.config.config import settings
 from app.src.database.models import User
 from app.src.database.redis import get_redis
 from app.src.database.base import get_db
+from app.src.services.user_cache import user_cache
+from app.src.services.passwords import password_hasher
+from app.src.services.rate_limit import RateLimit
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 logger = logging.getLogger(__name__)
@@ -29,6 +35,7 @@ logger = logging.getLogger(__name__)
     "/signup",
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("signup"))],
     summary="Register a new user",
     description="Creates a new user account with the provided email and password. Sends a verification email to confirm the account."
 )
@@ -38,14 +45,13 @@ async def signup(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        existing_user = await get_user_by_email(user_data.email, db)
-        if existing_user:
+        if await email_exists(user_data.email, db):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Email {user_data.email} already registered. Please use a different email or log in."
             )
 
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
         new_user = User(
             email=user_data.email,
             password=hashed_password,
@@ -76,6 +82,7 @@ async def signup(
 @router.post(
     "/login",
     response_model=dict,
+    dependencies=[Depends(RateLimit("login"))],
     summary="Authenticate a user",
     description="Authenticates a user with email and password, returning JWT access token and user details."
 )
@@ -84,13 +91,19 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     try:        
-        user = await get_user_by_email(form_data.username, db)
-        if not user or not verify_password(form_data.password, user.password):
+        user = await get_user_credentials(form_data.username, db)
+        valid, new_hash = (False, None)
+        if user:
+            valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"}
             )
+        if new_hash:
+            # Вартість bcrypt змінилась у налаштуваннях — перехешовуємо пароль.
+            await update_password_hash(user.id, new_hash, db)
 
         access_token = create_access_token(
             data={"sub": user.email},
@@ -100,7 +113,7 @@ async def login(
         return {
             "access_token": access_token,
             "token_type": "bearer",
-            "user": UserResponse.from_orm(user)
+            "user": UserResponse.model_validate(user)
         }
 
     except HTTPException:
@@ -122,7 +135,7 @@ async def verify_email(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+        payload = get_token_service().decode(token)
         user_id = payload.get("sub")
         token_type = payload.get("type")
 
@@ -145,15 +158,16 @@ async def verify_email(
 
         user.confirmed = True
         await db.commit()
+        await user_cache.invalidate(user.email)
 
         return {"message": "Email successfully verified"}
 
-    except jwt.ExpiredSignatureError:
+    except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Verification token expired"
         )
-    except jwt.InvalidTokenError as e:
+    except InvalidTokenError as e:
         logger.error(f"Invalid token: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,19 +194,23 @@ async def get_current_user_profile(
 
 @router.patch(
     "/avatar",
-    response_model=UserResponse,
+    response_model=AvatarStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Update user avatar",
-    description="Uploads a new avatar for the authenticated user."
+    description=(
+        "Accepts a new avatar for the authenticated user. The image is resized and uploaded "
+        "in the background; poll GET /auth/avatar/status for the result."
+    )
 )
 async def update_avatar(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     try:
-        avatar_url = await upload_avatar(file, current_user.email)
-        updated_user = await update_user_avatar(current_user.id, avatar_url, db)
-        return UserResponse.from_orm(updated_user)
+        upload_status = await schedule_avatar_update(file, current_user.id, current_user.avatar)
+        return AvatarStatusResponse(status=upload_status, avatar=current_user.avatar)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update avatar error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -200,9 +218,22 @@ async def update_avatar(
             detail="Failed to update avatar"
         )
 
+@router.get(
+    "/avatar/status",
+    response_model=AvatarStatusResponse,
+    summary="Avatar upload status",
+    description="Returns the state of the latest avatar upload: pending, done or failed."
+)
+async def avatar_status(
+    current_user: User = Depends(get_current_user)
+):
+    upload_status = await get_avatar_status(current_user.id)
+    return AvatarStatusResponse(status=upload_status or "done", avatar=current_user.avatar)
+
 @router.post(
     "/password-reset-request",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RateLimit("password_reset_request"))],
     summary="Request password reset",
     description="Sends a password reset email."
 )
@@ -212,8 +243,7 @@ async def request_password_reset(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        user = await get_user_by_email(user_email.email, db)
-        if not user:
+        if not await email_exists(user_email.email, db):
             return {"message": "If the email exists, password reset instructions have been sent"}
 
         reset_token = create_password_reset_token(user_email.email)
@@ -273,7 +303,7 @@ async def test_redis(redis=Depends(get_redis)):
     try:
         await redis.set("test_key", "Hello, Redis!")
         value = await redis.get("test_key")
-        return {"message": value.decode("utf-8") if value else "No value found"}
+        return {"message": value if value else "No value found"}
     except Exception as e:
         logger.error(f"Redis error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -284,6 +314,7 @@ async def test_redis(redis=Depends(get_redis)):
 @router.post(
     "/auth/login",
     response_model=dict,
+    dependencies=[Depends(RateLimit("login"))],
     include_in_schema=False
 )
 async def swagger_login(
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.src.database import get_db
 from app.src.database.models import Contact, User
 from app.src.repository import contacts as repository_contacts
-from app.src.schemas import ContactCreate, ContactUpdate, ContactResponse
-from app.src.services.auth import get_current_user
-from app.src.database.models import User
+from app.src.schemas import (
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactBatchRequest,
+    ContactBatchResponse,
+)
+from app.src.services.auth import get_current_user, get_read_db
+from app.src.services.contacts_import import import_contacts
+from app.src.services.contacts_export import MEDIA_TYPES, export_contacts
+from app.src.services.rate_limit import RateLimit
+from app.src.services.response_cache import response_cache
+from app.src.services import fast_json
 from app.src.repository.contacts import get_contact
+from app.src.repository.read_models import ContactRow
 from datetime import date, timedelta
-from typing import List     
+from typing import List, Literal, Optional     
 
 router = APIRouter(tags=["contacts"])
 
+contact_adapter = TypeAdapter(ContactResponse)
+contact_list_adapter = TypeAdapter(List[ContactResponse])
+
 @router.post("/", response_model=ContactResponse, status_code=201)
 async def create_contact(       
     contact: ContactCreate, 
@@ -21,21 +38,131 @@ async def create_contact(
     """ 
     Create a new contact for the authenticated user
     """
-    db_contact = await repository_contacts.create_contact(db, contact, current_user.id)
+    try:
+        db_contact = await repository_contacts.create_contact(db, contact, current_user.id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A contact with this email already exists"
+        )
     return db_contact
 
+@router.post(
+    "/batch",
+    response_model=ContactBatchResponse,
+    summary="Apply a batch of contact changes",
+    description=(
+        "Applies a list of create/update/delete operations in a single transaction "
+        "and returns a result for each operation, in request order."
+    )
+)
+async def batch_contacts(
+    batch: ContactBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        results = await repository_contacts.apply_batch(db, batch.operations, current_user.id)
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Batch rejected, no changes were applied: {e.orig}"
+        )
+    return {"results": results}
+
+@router.post(
+    "/import",
+    summary="Bulk import contacts",
+    description=(
+        "Streams a CSV (with a header row of ContactCreate field names) or JSON Lines "
+        "request body, validates rows in batches and upserts them by email. "
+        "The format is taken from the `format` parameter or the Content-Type header. "
+        "Returns a per-row error report."
+    )
+)
+async def import_contacts_endpoint(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type in ("text/csv", "application/csv"):
+            format = "csv"
+        elif content_type in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+            format = "jsonl"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send text/csv or application/x-ndjson, or pass ?format=csv|jsonl"
+            )
+    return await import_contacts(db, request.stream(), format, current_user.id)
+
 @router.get("/", response_model=List[ContactResponse])
 async def read_contacts(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    skip: int = Query(0, ge=0, description="Legacy offset pagination; prefer cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's Link header"),
+    sort: Literal["id", "email", "name", "birthday"] = "id",
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get list of contacts for the authenticated user
+    Get list of contacts for the authenticated user.
+
+    Pages are keyset-paginated: when more results exist, the response carries
+    an X-Next-Cursor header and a Link header with rel="next".
+    With sort=birthday, contacts that have no birthday are left out.
+    Responses are cached per user and carry an ETag; send If-None-Match to get 304.
     """
-    contacts = await repository_contacts.get_contacts(db, current_user.id, skip=skip, limit=limit)
-    return contacts
+    fast = fast_json.enabled("contacts:list")
+
+    async def load():
+        try:
+            contacts = await repository_contacts.get_contacts(
+                db, current_user.id, skip=skip, limit=limit, cursor=cursor, sort=sort,
+                read_model=ContactRow if fast else None
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        headers = {}
+        if not skip:
+            next_cursor = repository_contacts.next_cursor(contacts, limit, sort)
+            if next_cursor:
+                next_url = request.url.include_query_params(cursor=next_cursor)
+                headers["X-Next-Cursor"] = next_cursor
+                headers["Link"] = f'<{next_url}>; rel="next"'
+        if fast:
+            return fast_json.dump_contacts(contacts), headers
+        return contact_list_adapter.dump_json(contact_list_adapter.validate_python(contacts)), headers
+
+    return await response_cache.respond(
+        request, current_user.id, "contacts:list",
+        {"skip": skip, "limit": limit, "cursor": cursor, "sort": sort},
+        load
+    )
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all contacts",
+    description="Streams every contact of the authenticated user as CSV or JSON Lines, optionally gzip-compressed."
+)
+async def export_contacts_endpoint(
+    format: Literal["csv", "jsonl", "ndjson"] = "csv",
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    extension = "csv" if format == "csv" else "jsonl"
+    filename = f"contacts.{extension}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_contacts(current_user.id, format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get(
     "/{contact_id}",
@@ -45,16 +172,22 @@ async def read_contacts(
 )
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    contact = await get_contact(db, contact_id, current_user)
-    if contact is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Contact with ID {contact_id} not found or does not belong to user {current_user.email}. Please check the ID or your permissions."
-        )
-    return contact
+    async def load():
+        contact = await get_contact(db, contact_id, current_user, read_model=ContactRow)
+        if contact is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Contact with ID {contact_id} not found or does not belong to user {current_user.email}. Please check the ID or your permissions."
+            )
+        return contact_adapter.dump_json(contact_adapter.validate_python(contact)), {}
+
+    return await response_cache.respond(
+        request, current_user.id, "contacts:detail", {"id": contact_id}, load
+    )
 
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
@@ -66,7 +199,13 @@ async def update_contact(
     """
     Update a contact
     """
-    db_contact = await repository_contacts.update_contact(db, contact_id, contact, current_user.id)
+    try:
+        db_contact = await repository_contacts.update_contact(db, contact_id, contact, current_user.id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A contact with this email already exists"
+        )
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
     return db_contact
@@ -85,25 +224,52 @@ async def delete_contact(
         raise HTTPException(status_code=404, detail="Contact not found")
     return db_contact
 
-@router.get("/search/", response_model=List[ContactResponse])
+@router.get(
+    "/search/",
+    response_model=List[ContactResponse],
+    dependencies=[Depends(RateLimit("contacts_search"))]
+)
 async def search_contacts(
     query: str = Query(..., min_length=1),
-    db: AsyncSession = Depends(get_db),
+    mode: Literal["full", "prefix"] = Query("full", description="Use prefix for typeahead"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Search contacts by name or email
+    Search contacts by name or email, best matches first
     """
-    contacts = await repository_contacts.search_contacts(db, query, current_user.id)
+    if fast_json.enabled("contacts:search"):
+        rows = await repository_contacts.search_contacts(
+            db, query, current_user.id, prefix=mode == "prefix", limit=limit,
+            read_model=ContactRow
+        )
+        return Response(fast_json.dump_contacts(rows), media_type="application/json")
+
+    contacts = await repository_contacts.search_contacts(
+        db, query, current_user.id, prefix=mode == "prefix", limit=limit
+    )
     return contacts
 
 @router.get("/upcoming_birthdays/", response_model=List[ContactResponse])
 async def get_upcoming_birthdays(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    days: int = Query(7, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get contacts with birthdays in the next 7 days
+    Get contacts with birthdays in the next `days` days (7 by default)
     """
-    contacts = await repository_contacts.upcoming_birthdays(db, current_user.id)
-    return contacts
\ No newline at end of file
+    async def load():
+        contacts = await repository_contacts.upcoming_birthdays(db, current_user.id, days=days)
+        if fast_json.enabled("contacts:birthdays"):
+            return fast_json.dump_contacts(contacts), {}
+        return contact_list_adapter.dump_json(contact_list_adapter.validate_python(contacts)), {}
+
+    # Результат залежить від поточної дати, тож вона входить у ключ кешу.
+    return await response_cache.respond(
+        request, current_user.id, "contacts:birthdays",
+        {"days": days, "today": date.today()},
+        load
+    )
\ No newline at end of file
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from redis.exceptions import RedisError
+from app.src.database import redis as redis_db
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get(
+    "/redis",
+    summary="Redis health",
+    description="Pings Redis through the shared connection pool and reports latency and pool usage."
+)
+async def redis_health():
+    try:
+        latency = await redis_db.ping()
+    except RedisError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Redis unavailable: {str(e)}"
+        )
+    return {
+        "status": "ok",
+        "latency_ms": round(latency * 1000, 3),
+        "pool": redis_db.pool_stats()
+    }
+
+@router.get(
+    "/live",
+    summary="Liveness",
+    description="Returns 200 while the process is running."
+)
+async def liveness():
+    return {"status": "ok"}
+
+@router.get(
+    "/ready",
+    summary="Readiness",
+    description="Returns 200 only after start-up warm-up has finished and until shutdown begins."
+)
+async def readiness(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Application is warming up or shutting down"
+        )
+    return {"status": "ready"}
@@ -1 +1,13 @@
-from .contact import ContactBase, ContactCreate, ContactUpdate, ContactResponse
+from .contact import (
+    ContactBase,
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactBatchCreate,
+    ContactBatchUpdate,
+    ContactBatchDelete,
+    ContactBatchOperation,
+    ContactBatchRequest,
+    ContactBatchResult,
+    ContactBatchResponse,
+)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date
+from typing import Annotated, List, Literal, Union
 
 class ContactBase(BaseModel):
     first_name: str
@@ -21,7 +22,40 @@ class ContactUpdate(BaseModel):
     additional_info: str | None = None
     
 class ContactResponse(ContactBase): 
+    # Контакти, створені до появи дня народження, мають його порожнім.
+    birthday: date | None
     id: int
 
     class Config:   
         from_attributes = True
+
+class ContactBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: ContactCreate
+
+class ContactBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: ContactUpdate
+
+class ContactBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+ContactBatchOperation = Annotated[
+    Union[ContactBatchCreate, ContactBatchUpdate, ContactBatchDelete],
+    Field(discriminator="op")
+]
+
+class ContactBatchRequest(BaseModel):
+    operations: List[ContactBatchOperation] = Field(..., min_length=1, max_length=500)
+
+class ContactBatchResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    status: Literal["created", "updated", "deleted", "not_found", "conflict"]
+    id: int | None = None
+    detail: str | None = None
+
+class ContactBatchResponse(BaseModel):
+    results: List[ContactBatchResult]
@@ -12,6 +12,9 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+class AvatarStatusResponse(BaseModel):
+    status: str
+    avatar: str | None = None
 class UserEmailSchema(BaseModel):
     email: EmailStr
 class ResetPasswordSchema(BaseModel):
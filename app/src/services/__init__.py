@@ -1,3 +1,9 @@
-from .auth import get_current_user, create_access_token, verify_password, get_password_hash
+__all__ = ['get_current_user', 'create_access_token', 'verify_password', 'get_password_hash']
 
-__all__ = ['get_current_user', 'create_access_token', 'verify_password', 'get_password_hash']
\ No newline at end of file
+def __getattr__(name):
+    # Ліниві реекспорти: імпорт підмодуля (наприклад, services.tokens)
+    # не тягне за собою auth разом з налаштуваннями та базою даних.
+    if name in __all__:
+        from . import auth
+        return getattr(auth, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,7 @@
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, UploadFile, status
 from fastapi.security import HTTPBearer
 from sqlalchemy import select
@@ -10,25 +9,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.src.config.config import settings
 from app.src.database.models import User  
 from app.src.database.database import get_db  
+from app.src.database.replicas import replica_router
+from app.src.services.user_cache import user_cache, attach_cached_user
+from app.src.services.passwords import password_hasher
+from app.src.services.tokens import PyJWTError as JWTError, get_token_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/auth/login")
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Перевіряє, чи збігається пароль з хешем"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Перевіряє, чи збігається пароль з хешем (у пулі потоків)"""
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Генерує хеш пароля"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Генерує хеш пароля (у пулі потоків)"""
+    return await password_hasher.hash(password)
+
+@lru_cache(maxsize=None)
+def admin_emails() -> frozenset:
+    """Email-и адміністраторів з налаштування admin_emails."""
+    return frozenset(
+        email.strip().lower() for email in settings.admin_emails.split(",") if email.strip()
+    )
+
+def is_admin(email: Optional[str]) -> bool:
+    return bool(email) and email.lower() in admin_emails()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Генерує JWT токен"""
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
+    return get_token_service().encode(
+        data,
+        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    )
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     """Отримує поточного авторизованого користувача"""
@@ -38,25 +50,44 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm]) 
+        payload = get_token_service().decode(token) 
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    cached = await user_cache.get(email)
+    if cached is not None:
+        return await attach_cached_user(cached, db)
+
     stmt = select(User).where(User.email == email)
     result = await db.execute(stmt)
     user = result.scalars().first()
     
     if user is None:
         raise credentials_exception
+    await user_cache.set(email, user)
     return user
 
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Поточний користувач, якщо він є в admin_emails, інакше 403"""
+    if not is_admin(current_user.email):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+async def get_read_db(current_user: User = Depends(get_current_user)) -> AsyncSession:
+    """Сесія лише для читання даних поточного користувача: репліка або primary"""
+    async with replica_router.read_session(current_user.id) as session:
+        yield session
+
 def decode_token(token: str) -> Dict[str, Any]:
     """Декодує JWT токен"""
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])  
+        return get_token_service().decode(token)  
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -94,7 +125,7 @@ async def get_user_by_email(email: str, db: AsyncSession) -> Optional[User]:
 async def reset_user_password(token: str, new_password: str, db: AsyncSession) -> Optional[User]:
     """Асинхронна функція для скидання паролю"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])  
+        payload = get_token_service().decode(token)  
         if payload.get("type") != "password_reset":
             return None
         
@@ -106,9 +137,10 @@ async def reset_user_password(token: str, new_password: str, db: AsyncSession) -
         if not user:
             return None
         
-        user.hashed_password = pwd_context.hash(new_password)
+        user.password = await get_password_hash(new_password)
         await db.commit()
         await db.refresh(user)
+        await user_cache.invalidate(email)
         return user
         
     except JWTError:
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Protocol, Set
+
+import aiofiles
+from fastapi import HTTPException, UploadFile, status
+from redis.exceptions import RedisError
+
+from app.src.config.config import settings
+from app.src.database.base import AsyncSessionLocal
+from app.src.database.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZE = (250, 250)
+CHUNK_SIZE = 64 * 1024
+STATUS_PREFIX = "avatar:status:"
+HASH_PREFIX = "avatar:sha256:"
+STATUS_TTL = 3600
+# Ключі хеш -> URL лише прискорюють дедуплікацію: після закінчення строку
+# зображення обробляється знову, а файл у сховищі лишається тим самим.
+HASH_TTL = 30 * 24 * 3600
+# Запас на заголовки й межі multipart понад avatar_max_bytes самого файлу.
+MULTIPART_OVERHEAD = 64 * 1024
+
+def _new_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.avatar_workers, thread_name_prefix="avatar")
+
+
+_executor = _new_executor()
+_pending_tasks: Set[asyncio.Task] = set()
+
+
+class AvatarStorage(Protocol):
+    async def save(self, key: str, data: bytes) -> str:
+        """Зберігає JPEG-зображення і повертає його публічний URL."""
+        ...
+
+
+class LocalAvatarStorage:
+    """Зберігає аватари у файловій системі; для локальної розробки та тестів."""
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    async def save(self, key: str, data: bytes) -> str:
+        path = self.root / f"{key}.jpg"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(path, "wb") as buffer:
+                await buffer.write(data)
+        return f"{self.base_url}/{key}.jpg"
+
+
+class CloudinaryAvatarStorage:
+    """Завантажує аватари на Cloudinary; синхронний SDK виконується в пулі потоків."""
+
+    async def save(self, key: str, data: bytes) -> str:
+        from app.src.services.cloudinary_service import upload_image
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, upload_image, data, key)
+
+
+@lru_cache(maxsize=1)
+def get_avatar_storage() -> AvatarStorage:
+    if settings.avatar_storage == "local":
+        return LocalAvatarStorage(settings.avatar_local_dir, settings.avatar_base_url)
+    return CloudinaryAvatarStorage()
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def lookup_url(digest: str) -> Optional[str]:
+    """URL уже збереженого зображення з таким самим вмістом, якщо воно є."""
+    try:
+        return await get_redis_client().get(f"{HASH_PREFIX}{digest}")
+    except RedisError as e:
+        logger.warning(f"Avatar hash lookup failed: {str(e)}")
+        return None
+
+
+async def remember_url(url: str, *digests: str) -> None:
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            for digest in digests:
+                pipe.set(f"{HASH_PREFIX}{digest}", url, ex=HASH_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Avatar hash write failed: {str(e)}")
+
+
+async def store_avatar_image(data: bytes, raw_digest: Optional[str] = None) -> str:
+    """
+    Нормалізує зображення і зберігає його в сховищі за хешем вмісту.
+
+    Однакові зображення (як сирі файли, так і після нормалізації)
+    не завантажуються повторно: повертається вже відомий URL.
+    """
+    raw_digest = raw_digest or content_digest(data)
+    url = await lookup_url(raw_digest)
+    if url:
+        return url
+
+    image = await process_avatar(data)
+    digest = content_digest(image)
+    url = await lookup_url(digest)
+    if not url:
+        # Ключ у сховищі — хеш вмісту, тож файл за URL ніколи не перезаписується.
+        url = await get_avatar_storage().save(digest, image)
+    await remember_url(url, raw_digest, digest)
+    return url
+
+
+async def read_upload(file: UploadFile, max_bytes: Optional[int] = None) -> bytes:
+    """
+    Читає файл частинами і перериває читання, щойно перевищено ліміт розміру.
+
+    Розмір усього запиту обмежує BodySizeLimitMiddleware ще до розбору
+    multipart; тут перевіряється сам файл.
+    """
+    max_bytes = max_bytes or settings.avatar_max_bytes
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Файл завеликий, максимум {max_bytes // 1024} КБ"
+            )
+    if not buffer:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Файл порожній")
+    return bytes(buffer)
+
+
+def normalize_image(data: bytes) -> bytes:
+    """
+    Обрізає зображення до 250x250 і перекодовує в JPEG.
+    Виконується в пулі потоків, а не в event loop.
+    """
+    # Pillow потрібен лише тут, тож імпортується під час першої обробки.
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGB")
+            image = ImageOps.fit(image, AVATAR_SIZE, Image.LANCZOS)
+            output = BytesIO()
+            image.save(output, format="JPEG", quality=85, optimize=True)
+            return output.getvalue()
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"Unsupported image: {str(e)}") from e
+
+
+def verify_image(data: bytes) -> None:
+    """
+    Швидка перевірка, що файл — зображення, яке Pillow зможе обробити:
+    заголовок і структура без повного декодування пікселів.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Unsupported image: {str(e)}") from e
+
+
+async def check_image(data: bytes) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_executor, verify_image, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def process_avatar(data: bytes) -> bytes:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_executor, normalize_image, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def set_status(user_id: int, value: str) -> None:
+    try:
+        await get_redis_client().set(f"{STATUS_PREFIX}{user_id}", value, ex=STATUS_TTL)
+    except RedisError as e:
+        logger.warning(f"Avatar status write failed: {str(e)}")
+
+
+async def get_status(user_id: int) -> Optional[str]:
+    try:
+        return await get_redis_client().get(f"{STATUS_PREFIX}{user_id}")
+    except RedisError as e:
+        logger.warning(f"Avatar status read failed: {str(e)}")
+        return None
+
+
+async def _store_avatar(user_id: int, data: bytes, raw_digest: str) -> None:
+    from app.src.repository.users import update_user_avatar
+
+    try:
+        url = await store_avatar_image(data, raw_digest)
+        async with AsyncSessionLocal() as db:
+            await update_user_avatar(user_id, url, db)
+        await set_status(user_id, "done")
+    except Exception as e:
+        logger.error(f"Avatar pipeline failed for user {user_id}: {str(e)}", exc_info=True)
+        await set_status(user_id, "failed")
+
+
+async def schedule_avatar_update(file: UploadFile, user_id: int, current_avatar: Optional[str]) -> str:
+    """
+    Приймає файл у межах запиту, а обробку та завантаження в сховище
+    запускає фоново. Повертає "done", якщо такий самий файл уже є
+    аватаром користувача, інакше "pending"; стан дає get_status().
+
+    Raises:
+        HTTPException: 400, якщо файл не є зображенням
+    """
+    data = await read_upload(file)
+    raw_digest = content_digest(data)
+    if current_avatar and await lookup_url(raw_digest) == current_avatar:
+        return "done"
+    await check_image(data)
+
+    await set_status(user_id, "pending")
+    task = asyncio.get_running_loop().create_task(_store_avatar(user_id, data, raw_digest))
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+    return "pending"
+
+
+async def drain(timeout: float) -> None:
+    """
+    Чекає на фонові завантаження аватарів під час зупинки застосунку;
+    те, що не встигло за timeout секунд, скасовується.
+    """
+    global _executor
+    if _pending_tasks:
+        _, pending = await asyncio.wait(set(_pending_tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} avatar uploads on shutdown")
+    # Потоки завершуються у фоні; новий пул створить потоки лише за потреби.
+    old, _executor = _executor, _new_executor()
+    old.shutdown(wait=False)
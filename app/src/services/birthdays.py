@@ -0,0 +1,107 @@
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.database.models import Contact, birthday_key
+from app.src.database.redis import get_redis_client
+from app.src.repository.read_models import ContactRow, select_model, to_models
+
+logger = logging.getLogger(__name__)
+
+# Записи кешу — кортежі полів ContactRow; версія в префіксі змінюється
+# разом із набором полів.
+CACHE_PREFIX = "birthdays:v3:"
+
+
+def _cache_key(user_id: int) -> str:
+    return f"{CACHE_PREFIX}{user_id}"
+
+
+def _serialize(contact: ContactRow) -> List[Any]:
+    return [value.isoformat() if isinstance(value, date) else value for value in contact]
+
+
+def _deserialize(values: List[Any]) -> ContactRow:
+    contact = ContactRow._make(values)
+    if contact.birthday is not None:
+        contact = contact._replace(birthday=date.fromisoformat(contact.birthday))
+    return contact
+
+
+def birthday_window_clause(today: date, days: int):
+    """
+    Умова для днів народження в найближчі days днів, враховуючи
+    перехід через Новий рік. Використовує індекс (user_id, birthday_mmdd).
+    """
+    if days >= 365:
+        return Contact.birthday_mmdd.isnot(None)
+    start = birthday_key(today)
+    end = birthday_key(today + timedelta(days=days))
+    if start <= end:
+        return Contact.birthday_mmdd.between(start, end)
+    return or_(Contact.birthday_mmdd >= start, Contact.birthday_mmdd <= end)
+
+
+async def _query(db: AsyncSession, user_id: int, today: date, days: int) -> List[ContactRow]:
+    stmt = (
+        select_model(ContactRow)
+        .add_columns(Contact.birthday_mmdd)
+        .where(Contact.user_id == user_id, birthday_window_clause(today, days))
+        .order_by(Contact.birthday_mmdd, Contact.id)
+    )
+    result = await db.execute(stmt)
+    start = birthday_key(today)
+    # Після переходу через Новий рік січневі дати мають іти після грудневих.
+    rows = sorted(result.all(), key=lambda r: (r.birthday_mmdd < start, r.birthday_mmdd, r.id))
+    return to_models(ContactRow, (row[:-1] for row in rows))
+
+
+async def upcoming_birthdays(
+    db: AsyncSession,
+    user_id: int,
+    days: int = 7,
+    today: Optional[date] = None
+) -> List[ContactRow]:
+    """
+    Контакти користувача з днем народження в найближчі days днів,
+    у порядку днів народження.
+
+    Результат кешується в Redis до кінця доби. Кеш містить готові рядки
+    контактів, тож репозиторій скидає його (invalidate) після кожної
+    зміни контактів користувача, до відповіді на запит.
+    """
+    today = today or date.today()
+    field = f"{today.isoformat()}:{days}"
+    redis = get_redis_client()
+
+    try:
+        cached = await redis.hget(_cache_key(user_id), field)
+    except RedisError as e:
+        logger.warning(f"Birthday cache read failed: {str(e)}")
+        cached = None
+    if cached is not None:
+        return [_deserialize(values) for values in json.loads(cached)]
+
+    contacts = await _query(db, user_id, today, days)
+
+    try:
+        midnight = datetime.combine(today + timedelta(days=1), time.min)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_cache_key(user_id), field, json.dumps([_serialize(c) for c in contacts]))
+            pipe.expireat(_cache_key(user_id), midnight)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Birthday cache write failed: {str(e)}")
+    return contacts
+
+
+async def invalidate(user_id: int) -> None:
+    try:
+        await get_redis_client().delete(_cache_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Birthday cache invalidation failed: {str(e)}")
@@ -0,0 +1,49 @@
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI-обмеження розміру тіла запиту для окремих маршрутів.
+
+    Starlette зберігає multipart-файл цілком (у пам'ять чи на диск) ще до
+    виклику обробника, тож перевірка розміру в обробнику вже нічого не
+    обмежує. Тут запит із завеликим Content-Length відхиляється з 413 до
+    читання тіла, а тіло без Content-Length (chunked) рахується під час
+    читання і обривається, щойно перевищить ліміт.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[Tuple[str, str], int]):
+        # (метод, шлях) -> максимальний розмір тіла в байтах
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body too large, maximum {limit // 1024} KB"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI пробрасує HTTPException з розбору тіла як є.
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
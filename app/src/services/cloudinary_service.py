@@ -2,27 +2,55 @@ import cloudinary
 import cloudinary.uploader
 from fastapi import UploadFile, HTTPException
 from app.src.config.config import settings
+from functools import lru_cache
 from typing import Optional
 import logging
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
-# Ініціалізація Cloudinary
-cloudinary.config(
-    cloud_name=settings.cloud_name,
-    api_key=settings.cloud_api_key,
-    api_secret=settings.cloud_api_secret,
-    secure=True
-)
+@lru_cache(maxsize=None)
+def _configure() -> None:
+    """Ініціалізація Cloudinary під час першого завантаження, а не імпорту модуля."""
+    cloudinary.config(
+        cloud_name=settings.cloud_name,
+        api_key=settings.cloud_api_key,
+        api_secret=settings.cloud_api_secret,
+        secure=True
+    )
 
-async def upload_avatar(file: UploadFile, user_email: str) -> str:
+def upload_image(data: bytes, key: str) -> str:
+    """
+    Синхронно завантажує готовий JPEG на Cloudinary.
+    Викликається з пулу потоків (див. app.src.services.avatars).
+
+    Returns:
+        URL завантаженого зображення
+    """
+    _configure()
+    result = cloudinary.uploader.upload(
+        BytesIO(data),
+        public_id=key,
+        folder="avatars",
+        overwrite=True,
+        resource_type="image",
+        format="jpg"
+    )
+    if not result.get('secure_url'):
+        raise RuntimeError("Cloudinary response has no secure_url")
+    return result['secure_url']
+
+async def upload_avatar(file: UploadFile) -> str:
     """
     Завантажує аватар на Cloudinary з обробкою помилок та перевірками.
+
+    Файл читається частинами з обмеженням розміру, зображення
+    зменшується до 250x250 локально, а завантаження виконується
+    в пулі потоків, не блокуючи event loop. Повторне завантаження
+    того самого зображення повертає вже відомий URL.
     
     Args:
-        file: Файл аватара (UploadFile)
-        user_email: Email користувача для унікального імені файла
+        file: Файл аватара (UploadFile); ім'я у сховищі — хеш вмісту
         
     Returns:
         URL завантаженого аватара
@@ -30,45 +58,11 @@ async def upload_avatar(file: UploadFile, user_email: str) -> str:
     Raises:
         HTTPException: У разі помилки завантаження
     """
+    from app.src.services.avatars import read_upload, store_avatar_image
+
     try:
-        # Читаємо вміст файлу
-        contents = await file.read()
-        
-        # Перевірка, чи файл не порожній
-        if not contents:
-            raise HTTPException(
-                status_code=400,
-                detail="Файл порожній"
-            )
-        
-        # Створюємо BytesIO з вмістом файлу
-        file_bytes = BytesIO(contents)
-        
-        # Генеруємо унікальне public_id
-        public_id = f"avatars/{user_email.replace('@', '_at_').replace('.', '_dot_')}"
-        
-        # Завантаження на Cloudinary
-        result = cloudinary.uploader.upload(
-            file_bytes,
-            public_id=public_id,
-            folder="avatars",
-            overwrite=True,
-            resource_type="image",
-            transformation=[
-                {"width": 250, "height": 250, "crop": "fill"},
-                {"quality": "auto:good"}
-            ],
-            allowed_formats=["jpg", "png", "jpeg"],
-            format="jpg"  # Конвертуємо всі зображення в JPG для уніфікації
-        )
-        
-        if not result.get('secure_url'):
-            raise HTTPException(
-                status_code=500,
-                detail="Не вдалося отримати URL аватара"
-            )
-            
-        return result['secure_url']
+        contents = await read_upload(file)
+        return await store_avatar_image(contents)
     
     except cloudinary.exceptions.Error as e:
         logger.error(f"Cloudinary error: {str(e)}", exc_info=True)
@@ -85,4 +79,4 @@ async def upload_avatar(file: UploadFile, user_email: str) -> str:
         raise HTTPException(
             status_code=500,
             detail="Внутрішня помилка сервера при завантаженні аватара"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List
+
+from sqlalchemy import select
+
+from app.src.database.replicas import replica_router
+from app.src.database.models import Contact
+
+FETCH_SIZE = 1000
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/jsonl",
+    "ndjson": "application/x-ndjson",
+}
+# Службові колонки, які не експортуються.
+_INTERNAL_COLUMNS = {"user_id", "birthday_mmdd"}
+
+
+def export_columns() -> List:
+    return [c for c in Contact.__table__.columns if c.key not in _INTERNAL_COLUMNS]
+
+
+async def _rows(user_id: int) -> AsyncIterator[List]:
+    """
+    Пакети рядків через серверний курсор.
+
+    Сесія відкривається тут, а не через залежність: сесія з залежності
+    закривається ще до того, як StreamingResponse почне віддавати тіло.
+    Експорт лише читає, тож за можливості йде на репліку.
+    """
+    stmt = (
+        select(*export_columns())
+        .where(Contact.user_id == user_id)
+        .order_by(Contact.id)
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    async with replica_router.read_session(user_id) as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def _csv(user_id: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.key for c in export_columns()])
+    async for partition in _rows(user_id):
+        writer.writerows(partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _jsonl(user_id: int) -> AsyncIterator[bytes]:
+    keys = [c.key for c in export_columns()]
+    async for partition in _rows(user_id):
+        lines = [json.dumps(dict(zip(keys, row)), default=str, ensure_ascii=False) for row in partition]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_contacts(user_id: int, fmt: str, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Потік байтів з усіма контактами користувача у форматі CSV або JSON Lines.
+    Пам'ять обмежена одним пакетом з FETCH_SIZE рядків.
+    """
+    chunks = _csv(user_id) if fmt == "csv" else _jsonl(user_id)
+    return _gzip(chunks) if compress else chunks
@@ -0,0 +1,212 @@
+import codecs
+import csv
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.config.config import settings
+from app.src.repository import contacts as repository_contacts
+from app.src.schemas import ContactCreate
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int) -> AsyncIterator[Union[str, ValueError]]:
+    """
+    Розбиває потік байтів на рядки, не накопичуючи весь файл.
+
+    Рядок, довший за max_length, не буферизується: замість нього
+    повертається ValueError, а його решта пропускається до переносу.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    skipping = False
+    too_long = ValueError(f"Line exceeds {max_length} characters")
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if skipping:
+                # Кінець надто довгого рядка, про який уже повідомлено.
+                skipping = False
+            elif len(line) > max_length:
+                yield too_long
+            else:
+                yield line.rstrip("\r")
+        if len(pending) > max_length:
+            if not skipping:
+                yield too_long
+                skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield too_long if len(pending) > max_length else pending.rstrip("\r")
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[Union[str, ValueError]],
+    max_length: int
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Записи CSV як (номер рядка, dict). Поле в лапках може містити переноси
+    рядків: фізичні рядки склеюються, поки кількість лапок не стане парною.
+
+    Запис, довший за max_length (найчастіше — через незакриту лапку),
+    повертається як ValueError, і розбір продовжується з наступного рядка.
+    """
+    header = None
+    buffer: List[str] = []
+    size = quotes = 0
+    start = 0
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if isinstance(line, ValueError):
+            yield (start if buffer else line_no), line
+            buffer, size, quotes = [], 0, 0
+            continue
+        if not buffer:
+            start = line_no
+        buffer.append(line)
+        size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            if size > max_length:
+                yield start, ValueError(
+                    f"Record exceeds {max_length} characters; is a quoted field left unclosed?"
+                )
+                buffer, size, quotes = [], 0, 0
+            continue
+        record = "\n".join(buffer)
+        buffer, size, quotes = [], 0, 0
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield start, dict(zip(header, values))
+    if buffer:
+        yield start, ValueError("Unterminated quoted field")
+
+
+async def iter_jsonl_records(lines: AsyncIterator[Union[str, ValueError]]) -> AsyncIterator[Tuple[int, Any]]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if isinstance(line, ValueError):
+            yield line_no, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, ValueError(f"Invalid JSON: {str(e)}")
+
+
+def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: (None if value == "" else value) for key, value in record.items()}
+
+
+class ImportReport:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.processed = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.errors_truncated = False
+
+    def error(self, row: int, errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": errors})
+        else:
+            self.errors_truncated = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.errors_truncated,
+        }
+
+
+async def _flush(
+    db: AsyncSession,
+    batch: List[Tuple[int, ContactCreate]],
+    user_id: int,
+    report: ImportReport
+) -> None:
+    # ON CONFLICT не може змінити той самий рядок двічі в одному запиті,
+    # тому для повторюваних email у пакеті лишається останній запис.
+    unique: Dict[str, Tuple[int, ContactCreate]] = {}
+    for row, contact in batch:
+        previous = unique.get(contact.email)
+        if previous is not None:
+            report.error(previous[0], "Duplicate email in import; a later row replaced it")
+        unique[contact.email] = (row, contact)
+
+    rows = list(unique.values())
+    try:
+        # Конфлікт (user_id, email) оновлює рядок, тож записується кожен контакт пакета.
+        await repository_contacts.upsert_contacts(db, [c for _, c in rows], user_id)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Contact import batch failed: {str(e)}")
+        for row, _ in rows:
+            report.error(row, "Database error while writing batch")
+        return
+    report.imported += len(rows)
+
+
+async def import_contacts(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    user_id: int
+) -> Dict[str, Any]:
+    """
+    Потоковий імпорт контактів з CSV або JSON Lines.
+
+    Рядки перевіряються схемою ContactCreate і записуються пакетами по
+    settings.import_batch_size, кожен пакет в окремій транзакції.
+    """
+    max_length = settings.import_max_record_chars
+    lines = iter_lines(chunks, max_length)
+    records = iter_csv_records(lines, max_length) if fmt == "csv" else iter_jsonl_records(lines)
+    report = ImportReport(settings.import_max_errors)
+    batch: List[Tuple[int, ContactCreate]] = []
+
+    async for row, record in records:
+        report.processed += 1
+        if isinstance(record, Exception):
+            report.error(row, str(record))
+            continue
+        if not isinstance(record, dict):
+            report.error(row, "Expected an object")
+            continue
+        try:
+            batch.append((row, ContactCreate.model_validate(_clean(record))))
+        except ValidationError as e:
+            report.error(row, e.errors(include_url=False, include_context=False))
+            continue
+        if len(batch) >= settings.import_batch_size:
+            await _flush(db, batch, user_id, report)
+            batch = []
+
+    if batch:
+        await _flush(db, batch, user_id, report)
+    if report.imported:
+        await repository_contacts.invalidate_user_caches(user_id)
+    return report.as_dict()
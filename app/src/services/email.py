@@ -1,14 +1,13 @@
-import smtplib
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from redis.exceptions import RedisError
 from app.src.config.config import settings
+from app.src.services.mail_queue import enqueue
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
-import jwt
+from app.src.services.tokens import get_token_service
 from typing import Optional
 from functools import lru_cache 
+# Не ліниво: pydantic однаково імпортує email_validator для EmailStr у схемах.
 from email_validator import validate_email, EmailNotValidError
 
 logger = logging.getLogger(__name__)
@@ -20,26 +19,27 @@ def create_verification_token(user_id: int) -> str:
     """     
     payload = {
         "sub": str(user_id),
-        "exp": datetime.utcnow() + timedelta(hours=24),
         "type": "email_verification"
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return get_token_service().encode(payload, timedelta(hours=24))
 
 async def send_email(
     email_to: str,
     subject: str,
     template_name: str,
     template_vars: dict,    
-    smtp_timeout: int = 10
 ) -> bool:  
     """
     Універсальна функція для відправки email.
+
+    Лист лише додається до черги в Redis; надсилає його MailWorker
+    (python -m app.src.services.mail_queue) через пул SMTP-з'єднань.
     """
     try:
         # Валідація email
         if not settings.mail_test_mode:
             try:
-                valid = validate_email(email_to)
+                valid = validate_email(email_to, check_deliverability=False)
                 email_to = valid.email
             except EmailNotValidError as e:
                 logger.error(f"Invalid email: {str(e)}")
@@ -60,34 +60,13 @@ async def send_email(
         for key, value in template_vars.items():
             html_content = html_content.replace(f"{{{{{key}}}}}", str(value))
 
-        # Підготовка повідомлення
-        msg = MIMEMultipart()
-        msg["From"] = settings.mail_from
-        msg["To"] = email_to
-        msg["Subject"] = subject
-        msg.attach(MIMEText(html_content, "html"))
-
-        # Налаштування SMTP
-        smtp_params = {
-            "host": settings.mail_server,
-            "port": settings.mail_port,
-            "timeout": smtp_timeout
-        }
-
-        # Відправка
-        with smtplib.SMTP(**smtp_params) as server:
-            if settings.mail_starttls:
-                server.starttls()
-            server.login(settings.mail_username, settings.mail_password)
-            server.send_message(msg)
-        
-        logger.info(f"Email successfully sent to {email_to}")  
+        # Постановка в чергу
+        message_id = await enqueue(email_to, subject, html_content)
+        logger.info(f"Email {message_id} to {email_to} queued")  
         return True 
 
-    except smtplib.SMTPException as e:  
-        logger.error(f"SMTP error occurred: {str(e)}")  
-    except ssl.SSLError as e: 
-        logger.error(f"SSL error occurred: {str(e)}")  
+    except RedisError as e:  
+        logger.error(f"Failed to queue email: {str(e)}")  
     except Exception as e:  
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)  
     
@@ -138,10 +117,9 @@ def create_password_reset_token(email: str) -> str:
     """
     payload = {
         "sub": email,
-        "exp": datetime.utcnow() + timedelta(hours=24),
         "type": "password_reset"
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return get_token_service().encode(payload, timedelta(hours=24))
 
 @lru_cache(maxsize=32)
 def load_template(template_name: str) -> str:
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable
+
+import orjson
+
+from app.src.config.config import settings
+from app.src.repository.read_models import ContactRow
+
+
+def contact_payload(contact: ContactRow) -> Dict[str, Any]:
+    """
+    Словник полів ContactResponse з моделі читання контакту.
+
+    Дати лишаються date: orjson серіалізує їх у ISO-формат сам.
+    """
+    return {
+        "first_name": contact.first_name,
+        "last_name": contact.last_name,
+        "email": contact.email,
+        "phone_number": contact.phone_number,
+        "birthday": contact.birthday,
+        "additional_info": contact.additional_info,
+        "id": contact.id,
+    }
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value)
+
+
+def dump_contacts(rows: Iterable[Any]) -> bytes:
+    return orjson.dumps([contact_payload(row) for row in rows])
+
+
+@lru_cache(maxsize=None)
+def enabled(route: str) -> bool:
+    """
+    Чи увімкнено швидкий шлях для маршруту (налаштування fast_json_routes,
+    за замовчуванням вимкнено для всіх).
+
+    На відміну від response_model, швидкий шлях не перевіряє рядки схемою
+    ContactResponse: рядок, що їй не відповідає (наприклад, birthday NULL),
+    буде серіалізовано як є, а не призведе до помилки валідації.
+    """
+    routes = {name.strip() for name in settings.fast_json_routes.split(",")}
+    return route in routes or "*" in routes
@@ -0,0 +1,318 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from app.src.config.config import settings
+from app.src.database.redis import get_redis_client
+from app.src.monitoring.metrics import registry
+
+# aiosmtplib потрібен лише воркеру; веб-процес лише додає листи в чергу
+# (enqueue), тож бібліотека імпортується в методах пулу та воркера.
+if TYPE_CHECKING:
+    import aiosmtplib
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "mail:outbound"
+# Кожен воркер тримає листи в обробці у власному списку mail:processing:<id>
+# і поки живий, оновлює ключ mail:worker:<id>; усі id — у множині mail:workers.
+PROCESSING_PREFIX = "mail:processing:"
+HEARTBEAT_PREFIX = "mail:worker:"
+WORKERS_KEY = "mail:workers"
+RETRY_KEY = "mail:retry"
+DEAD_KEY = "mail:dead"
+
+mail_sent = registry.counter("mail_sent_total", "Успішно надіслані листи")
+mail_failed = registry.counter(
+    "mail_failed_total",
+    "Невдалі спроби надсилання листів",
+    labelnames=("final",)
+)
+mail_enqueued = registry.counter("mail_enqueued_total", "Листи, додані до черги")
+
+
+async def enqueue(email_to: str, subject: str, html: str) -> str:
+    """Додає лист до вихідної черги в Redis і повертає його id."""
+    message_id = uuid.uuid4().hex
+    payload = {
+        "id": message_id,
+        "to": email_to,
+        "subject": subject,
+        "html": html,
+        "attempts": 0,
+    }
+    await get_redis_client().lpush(QUEUE_KEY, json.dumps(payload))
+    mail_enqueued.inc()
+    return message_id
+
+
+def build_message(payload: Dict[str, Any]) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = settings.mail_from
+    msg["To"] = payload["to"]
+    msg["Subject"] = payload["subject"]
+    msg.attach(MIMEText(payload["html"], "html"))
+    return msg
+
+
+class SMTPConnectionPool:
+    """
+    Пул автентифікованих SMTP-з'єднань, що живуть між пакетами листів.
+    """
+
+    def __init__(self, size: int, timeout: int = 10):
+        self.size = size
+        self.timeout = timeout
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        import aiosmtplib
+
+        client = aiosmtplib.SMTP(
+            hostname=settings.mail_server,
+            port=settings.mail_port,
+            timeout=self.timeout,
+            use_tls=settings.mail_ssl_tls,
+            start_tls=settings.mail_starttls,
+        )
+        await client.connect()
+        if settings.mail_username:
+            await client.login(settings.mail_username, settings.mail_password)
+        return client
+
+    async def acquire(self) -> "aiosmtplib.SMTP":
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                return client
+            self._created -= 1
+        if self._created < self.size:
+            self._created += 1
+            try:
+                return await self._connect()
+            except Exception:
+                self._created -= 1
+                raise
+        client = await self._idle.get()
+        if not client.is_connected:
+            self._created -= 1
+            return await self.acquire()
+        return client
+
+    def release(self, client: "aiosmtplib.SMTP", broken: bool = False) -> None:
+        if broken or not client.is_connected:
+            self._created -= 1
+            client.close()
+            return
+        self._idle.put_nowait(client)
+
+    async def close(self) -> None:
+        import aiosmtplib
+
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+        self._created = 0
+
+
+class MailWorker:
+    """
+    Розбирає вихідну чергу пакетами та надсилає листи через пул з'єднань.
+
+    Лист переноситься у власний список воркера mail:processing:<id> на час
+    надсилання. Воркер оновлює своє серцебиття кожну третину
+    mail_worker_heartbeat_seconds; коли серцебиття воркера зникає (воркер
+    упав), інші воркери повертають його листи в чергу. Листи живих
+    воркерів не чіпаються, тож не надсилаються двічі. Невдалі листи
+    відкладаються в mail:retry з експоненційною затримкою, а після
+    mail_max_attempts спроб потрапляють у mail:dead.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.pool = SMTPConnectionPool(pool_size or settings.mail_pool_size)
+        self.batch_size = batch_size or settings.mail_batch_size
+        self.max_attempts = max_attempts or settings.mail_max_attempts
+        self.retry_base_seconds = retry_base_seconds or settings.mail_retry_base_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.mail_worker_heartbeat_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processing_key = f"{PROCESSING_PREFIX}{self.worker_id}"
+        self._stopping = asyncio.Event()
+        self.redis = get_redis_client()
+
+    async def heartbeat(self) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(f"{HEARTBEAT_PREFIX}{self.worker_id}", 1, px=int(self.heartbeat_seconds * 1000))
+            pipe.sadd(WORKERS_KEY, self.worker_id)
+            await pipe.execute()
+
+    async def _requeue(self, worker_id: str) -> int:
+        moved = 0
+        while await self.redis.lmove(f"{PROCESSING_PREFIX}{worker_id}", QUEUE_KEY, "RIGHT", "LEFT"):
+            moved += 1
+        return moved
+
+    async def recover(self) -> int:
+        """Повертає в чергу листи воркерів без серцебиття; повертає їх кількість."""
+        moved = 0
+        for worker_id in await self.redis.smembers(WORKERS_KEY):
+            if worker_id == self.worker_id or await self.redis.exists(f"{HEARTBEAT_PREFIX}{worker_id}"):
+                continue
+            count = await self._requeue(worker_id)
+            await self.redis.srem(WORKERS_KEY, worker_id)
+            if count:
+                logger.warning(f"Requeued {count} emails of stopped mail worker {worker_id}")
+            moved += count
+        return moved
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds / 3)
+            try:
+                await self.heartbeat()
+                await self.recover()
+            except RedisError as e:
+                logger.error(f"Mail worker heartbeat failed: {str(e)}")
+
+    async def _retire(self) -> None:
+        """Під час зупинки: незавершені листи — назад у чергу, серцебиття — геть."""
+        await self._requeue(self.worker_id)
+        await self.redis.delete(f"{HEARTBEAT_PREFIX}{self.worker_id}")
+        await self.redis.srem(WORKERS_KEY, self.worker_id)
+
+    async def _promote_due_retries(self) -> None:
+        due = await self.redis.zrangebyscore(RETRY_KEY, 0, time.time())
+        for raw in due:
+            if await self.redis.zrem(RETRY_KEY, raw):
+                await self.redis.lpush(QUEUE_KEY, raw)
+
+    async def _next_batch(self, block_timeout: float) -> List[str]:
+        first = await self.redis.blmove(QUEUE_KEY, self.processing_key, block_timeout, "RIGHT", "LEFT")
+        if first is None:
+            return []
+        batch = [first]
+        while len(batch) < self.batch_size:
+            raw = await self.redis.lmove(QUEUE_KEY, self.processing_key, "RIGHT", "LEFT")
+            if raw is None:
+                break
+            batch.append(raw)
+        return batch
+
+    async def _send_many(self, raws: List[str]) -> None:
+        import aiosmtplib
+
+        client = None
+        reconnected = False
+        index = 0
+        while index < len(raws):
+            if client is None:
+                try:
+                    client = await self.pool.acquire()
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    logger.error(f"SMTP connection failed: {str(e)}")
+                    for raw in raws[index:]:
+                        await self._fail(raw, str(e))
+                    return
+
+            raw = raws[index]
+            payload = json.loads(raw)
+            try:
+                await client.send_message(build_message(payload))
+            except (aiosmtplib.SMTPServerDisconnected, OSError) as e:
+                # Обрив з'єднання — не провина листа: з'єднання замінюється
+                # новим, і лист надсилається ще раз. Лише один раз, щоб сервер,
+                # який рве з'єднання саме на цьому листі, не зациклив воркер.
+                self.pool.release(client, broken=True)
+                client = None
+                if not reconnected:
+                    reconnected = True
+                    continue
+                await self._fail(raw, str(e))
+            except aiosmtplib.SMTPException as e:
+                await self._fail(raw, str(e))
+            else:
+                await self.redis.lrem(self.processing_key, 1, raw)
+                mail_sent.inc()
+                logger.info(f"Email successfully sent to {payload['to']}")
+            reconnected = False
+            index += 1
+
+        if client is not None:
+            self.pool.release(client)
+
+    async def _fail(self, raw: str, error: str) -> None:
+        payload = json.loads(raw)
+        payload["attempts"] += 1
+        payload["last_error"] = error
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key, 1, raw)
+            if payload["attempts"] >= self.max_attempts:
+                pipe.lpush(DEAD_KEY, json.dumps(payload))
+                mail_failed.inc(final="true")
+                logger.error(f"Giving up on email to {payload['to']}: {error}")
+            else:
+                delay = self.retry_base_seconds * 2 ** (payload["attempts"] - 1)
+                pipe.zadd(RETRY_KEY, {json.dumps(payload): time.time() + delay})
+                mail_failed.inc(final="false")
+                logger.warning(f"Email to {payload['to']} failed, retrying in {delay:.0f}s: {error}")
+            await pipe.execute()
+
+    async def process_batch(self, block_timeout: float = 1) -> int:
+        await self._promote_due_retries()
+        raws = await self._next_batch(block_timeout)
+        if not raws:
+            return 0
+        # Пакет ділиться між з'єднаннями пулу і надсилається паралельно.
+        chunks = [raws[i::self.pool.size] for i in range(self.pool.size)]
+        await asyncio.gather(*(self._send_many(chunk) for chunk in chunks if chunk))
+        return len(raws)
+
+    async def run(self) -> None:
+        await self.heartbeat()
+        await self.recover()
+        keep_alive = asyncio.create_task(self._keep_alive())
+        logger.info(f"Mail worker {self.worker_id} started")
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self.process_batch()
+                except RedisError as e:
+                    logger.error(f"Mail worker Redis error: {str(e)}")
+                    await asyncio.sleep(1)
+        finally:
+            keep_alive.cancel()
+            await self.pool.close()
+            await self._retire()
+        logger.info("Mail worker stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    await MailWorker().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
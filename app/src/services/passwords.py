@@ -0,0 +1,121 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from app.src.config.config import settings
+from app.src.monitoring.metrics import registry
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+hash_queue_depth = registry.gauge(
+    "password_hash_queue_depth",
+    "Операції хешування паролів, що чекають на вільний слот"
+)
+hash_in_flight = registry.gauge(
+    "password_hash_in_flight",
+    "Операції хешування паролів, що виконуються зараз"
+)
+hash_operations = registry.counter(
+    "password_hash_operations_total",
+    "Виконані операції з паролями",
+    labelnames=("op",)
+)
+hash_seconds = registry.counter(
+    "password_hash_seconds_total",
+    "Сумарний час виконання операцій з паролями",
+    labelnames=("op",)
+)
+
+
+class PasswordHasher:
+    """
+    Хешування bcrypt в обмеженому пулі потоків, щоб не блокувати event loop.
+
+    bcrypt звільняє GIL під час обчислення, тому потоків достатньо.
+    Кількість одночасних операцій обмежена семафором; решта чекає в черзі.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_concurrency: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @cached_property
+    def context(self) -> "CryptContext":
+        # passlib імпортується під час першого використання (warm_up у lifespan),
+        # а не під час імпорту застосунку.
+        from passlib.context import CryptContext
+
+        # min_rounds == max_rounds: хеші з іншою вартістю вважаються застарілими
+        # і перераховуються під час входу.
+        return CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=self.rounds,
+            bcrypt__min_rounds=self.rounds,
+            bcrypt__max_rounds=self.rounds,
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Семафор прив'язується до циклу подій, у якому вперше чекав, тож
+        # для кожного нового циклу (повторний старт lifespan, тести)
+        # створюється свій.
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, op: str, func, *args):
+        semaphore = self._get_semaphore()
+        hash_queue_depth.inc()
+        try:
+            await semaphore.acquire()
+        finally:
+            hash_queue_depth.dec()
+        hash_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            hash_in_flight.dec()
+            hash_operations.inc(op=op)
+            hash_seconds.inc(time.perf_counter() - start, op=op)
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Перевіряє пароль і, якщо хеш застарів, повертає новий хеш.
+        """
+        return await self._run("verify", self.context.verify_and_update, password, hashed)
+
+    async def warm_up(self) -> None:
+        """Passlib завантажує бекенд bcrypt ліниво; робимо це до першого входу."""
+        await self.hash("warm-up")
+
+    def shutdown(self) -> None:
+        # Новий пул не має потоків, доки його не використають, тож
+        # повторний старт застосунку в тому самому процесі працює.
+        old = self._executor
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        old.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.bcrypt_rounds,
+    workers=settings.password_hash_workers,
+    max_concurrency=settings.password_hash_max_concurrency,
+)
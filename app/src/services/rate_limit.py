@@ -0,0 +1,337 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from app.src.config.config import settings
+from app.src.database.redis import get_redis_client
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+
+rate_limit_decisions = registry.counter(
+    "rate_limit_decisions_total",
+    "Рішення rate limiter за маршрутами",
+    labelnames=("route", "result")
+)
+local_rejections = registry.counter(
+    "rate_limit_local_rejections_total",
+    "Запити, відхилені локальним фільтром без звернення до Redis"
+)
+
+
+@dataclass(frozen=True)
+class Policy:
+    """
+    Одне обмеження для маршруту.
+
+    scope: "ip" — адреса клієнта, "user" — id з bearer-токена (або IP для
+    анонімних запитів), "account" — email/username з тіла запиту,
+    "account_ip" — пара акаунт і адреса клієнта.
+    algorithm: "sliding" — ковзне вікно, не більше limit запитів за window
+    секунд; "bucket" — token bucket місткістю limit, що повністю
+    поповнюється за window секунд (дозволяє короткі сплески).
+    """
+    scope: str
+    algorithm: str
+    limit: int
+    window: int
+
+
+# Усі ліміти застосунку в одному місці; ключ — назва маршруту для RateLimit().
+POLICIES: Dict[str, Tuple[Policy, ...]] = {
+    "login": (
+        Policy("ip", "sliding", limit=20, window=60),
+        # Лише для пари (акаунт, IP): спільний ліміт акаунта дозволив би
+        # будь-кому, хто знає email, тримати власника заблокованим.
+        Policy("account_ip", "bucket", limit=5, window=300),
+    ),
+    "signup": (
+        Policy("ip", "sliding", limit=5, window=3600),
+    ),
+    "password_reset_request": (
+        Policy("ip", "sliding", limit=10, window=3600),
+        Policy("account", "sliding", limit=3, window=3600),
+    ),
+    "contacts_search": (
+        Policy("user", "bucket", limit=30, window=10),
+        Policy("ip", "sliding", limit=300, window=60),
+    ),
+}
+
+# Ковзне вікно з двох сусідніх фіксованих вікон в одному хеші:
+# count = prev * частка попереднього вікна, що ще у ковзному + cur.
+# Повертає {allowed, remaining, retry_after_ms}.
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local idx = math.floor(now / window)
+local elapsed = now - idx * window
+
+local data = redis.call('HMGET', key, 'idx', 'cur', 'prev')
+local stored = tonumber(data[1])
+local cur = tonumber(data[2]) or 0
+local prev = tonumber(data[3]) or 0
+if stored == nil or stored < idx - 1 then
+    cur, prev = 0, 0
+elseif stored == idx - 1 then
+    cur, prev = 0, cur
+end
+
+local weight = (window - elapsed) / window
+local count = prev * weight + cur
+if count + 1 > limit then
+    local retry = window - elapsed
+    if cur + 1 <= limit and prev > 0 then
+        retry = math.ceil((window - elapsed) - (limit - cur - 1) * window / prev)
+    end
+    return {0, 0, math.max(retry, 1)}
+end
+
+cur = cur + 1
+redis.call('HSET', key, 'idx', idx, 'cur', cur, 'prev', prev)
+redis.call('PEXPIRE', key, window * 2)
+return {1, math.floor(limit - count - 1), 0}
+"""
+
+# Token bucket: місткість limit, поповнення limit токенів за window мс.
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local rate = capacity / window
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local data = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(data[1])
+local ts = tonumber(data[2])
+if tokens == nil then
+    tokens, ts = capacity, now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed, retry = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, window)
+return {allowed, math.floor(tokens), retry}
+"""
+
+
+class LocalPreFilter:
+    """
+    Відсіює очевидні зловживання в процесі, без звернення до Redis.
+
+    Після відмови Redis ключ блокується локально до Retry-After. Для
+    ковзного вікна також рахуються дозволені цим процесом запити в
+    поточному фіксованому вікні: якщо їх уже не менше за ліміт, глобальний
+    лічильник точно перевищено.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._blocked: "OrderedDict[str, float]" = OrderedDict()
+        self._counts: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key: str, policy: Policy, now: float) -> Optional[float]:
+        """Повертає кількість секунд до повтору, якщо запит треба відхилити."""
+        with self._lock:
+            blocked_until = self._blocked.get(key)
+            if blocked_until is not None:
+                if blocked_until > now:
+                    return blocked_until - now
+                del self._blocked[key]
+
+            if policy.algorithm != "sliding":
+                return None
+            idx = int(now // policy.window)
+            stored_idx, count = self._counts.get(key, (idx, 0))
+            if stored_idx == idx and count >= policy.limit:
+                return (idx + 1) * policy.window - now
+            return None
+
+    def record(self, key: str, policy: Policy, now: float) -> None:
+        """Рахує запит, дозволений Redis; локальний лічильник не перевищує глобальний."""
+        if policy.algorithm != "sliding":
+            return
+        with self._lock:
+            idx = int(now // policy.window)
+            stored_idx, count = self._counts.get(key, (idx, 0))
+            if stored_idx != idx:
+                count = 0
+            self._counts[key] = (idx, count + 1)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_keys:
+                self._counts.popitem(last=False)
+
+    def block(self, key: str, until: float) -> None:
+        with self._lock:
+            self._blocked[key] = until
+            self._blocked.move_to_end(key)
+            while len(self._blocked) > self.max_keys:
+                self._blocked.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocked.clear()
+            self._counts.clear()
+
+
+class RateLimiter:
+    """
+    Перевіряє політики маршруту атомарними Lua-скриптами:
+    один round-trip до Redis на політику.
+    """
+
+    def __init__(self, max_local_keys: int = 10000):
+        self.local = LocalPreFilter(max_local_keys)
+        self._scripts: Dict[int, Dict[str, object]] = {}
+
+    def _script(self, algorithm: str):
+        # Script кешує SHA і сам робить EVAL після NOSCRIPT;
+        # прив'язка до клієнта, бо пул Redis можна перестворити.
+        client = get_redis_client()
+        scripts = self._scripts.get(id(client))
+        if scripts is None:
+            scripts = {
+                "sliding": client.register_script(SLIDING_WINDOW_LUA),
+                "bucket": client.register_script(TOKEN_BUCKET_LUA),
+            }
+            self._scripts = {id(client): scripts}
+        return scripts[algorithm]
+
+    async def hit(self, key: str, policy: Policy) -> Tuple[bool, int, float]:
+        """
+        Рахує запит за політикою. Повертає (дозволено, залишок, секунд до повтору).
+        """
+        now = time.time()
+        retry_after = self.local.check(key, policy, now)
+        if retry_after is not None:
+            local_rejections.inc()
+            return False, 0, retry_after
+
+        allowed, remaining, retry_ms = await self._script(policy.algorithm)(
+            keys=[key], args=[policy.limit, policy.window * 1000]
+        )
+        if not allowed:
+            retry_after = retry_ms / 1000
+            self.local.block(key, now + retry_after)
+            return False, 0, retry_after
+        self.local.record(key, policy, now)
+        return True, int(remaining), 0
+
+
+rate_limiter = RateLimiter(settings.rate_limit_local_max_keys)
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+
+
+def _bearer_subject(request: Request) -> Optional[str]:
+    from app.src.services.tokens import PyJWTError, get_token_service
+
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return get_token_service().decode(token).get("sub")
+    except PyJWTError:
+        return None
+
+
+async def _account(request: Request) -> Optional[str]:
+    # Starlette кешує розібране тіло, тож обробник маршруту
+    # не читає його вдруге.
+    content_type = request.headers.get("Content-Type", "")
+    try:
+        if content_type.startswith("application/json"):
+            body = await request.json()
+            value = body.get("email") if isinstance(body, dict) else None
+        else:
+            form = await request.form()
+            value = form.get("username") or form.get("email")
+    except ValueError:
+        return None
+    return value if isinstance(value, str) and value else None
+
+
+async def identity(request: Request, scope: str) -> str:
+    if scope == "user":
+        subject = _bearer_subject(request)
+        if subject:
+            return f"user:{_digest(subject)}"
+    elif scope in ("account", "account_ip"):
+        account = await _account(request)
+        if account and scope == "account_ip":
+            return f"account:{_digest(account)}:ip:{client_ip(request)}"
+        if account:
+            return f"account:{_digest(account)}"
+    return f"ip:{client_ip(request)}"
+
+
+class RateLimit:
+    """
+    Залежність FastAPI, що застосовує політики POLICIES[route].
+
+    Якщо Redis недоступний, запит пропускається (fail-open): rate limiter
+    не повинен класти вхід у систему разом із Redis.
+    """
+
+    def __init__(self, route: str):
+        if route not in POLICIES:
+            raise KeyError(f"Unknown rate limit route: {route}")
+        self.route = route
+        self.policies = POLICIES[route]
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        if not settings.rate_limit_enabled:
+            return
+        remaining = None
+        for policy in self.policies:
+            key = f"{KEY_PREFIX}:{self.route}:{policy.algorithm}:{await identity(request, policy.scope)}"
+            try:
+                allowed, left, retry_after = await rate_limiter.hit(key, policy)
+            except RedisError as e:
+                rate_limit_decisions.inc(route=self.route, result="error")
+                logger.warning(f"Rate limit check failed for {self.route}: {str(e)}")
+                continue
+            if not allowed:
+                rate_limit_decisions.inc(route=self.route, result="rejected")
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                )
+            remaining = left if remaining is None else min(remaining, left)
+        rate_limit_decisions.inc(route=self.route, result="allowed")
+        if remaining is not None:
+            response.headers["X-RateLimit-Remaining"] = str(remaining)
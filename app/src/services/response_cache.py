@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+
+from app.src.config.config import settings
+from app.src.database.redis import get_redis_client
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "resp:ver:"
+ENTRY_PREFIX = "resp:body:"
+
+# Завантажувач повертає вже серіалізоване тіло відповіді та її заголовки.
+Loader = Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]
+
+cache_requests = registry.counter(
+    "response_cache_requests_total",
+    "Звернення до кешу відповідей за маршрутами",
+    labelnames=("route", "result"),
+)
+cache_bumps = registry.counter(
+    "response_cache_bumps_total",
+    "Збільшення версії даних користувача після змін контактів",
+)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    """
+    Кеш готових JSON-відповідей на читання контактів.
+
+    Ключ — id користувача, версія його даних, маршрут і параметри запиту.
+    Версія — лічильник у Redis, який репозиторій контактів збільшує після
+    кожної зміни, тож старі записи просто перестають збігатися й
+    вичищаються за TTL. ETag теж виводиться з версії: для 304 досить
+    одного GET у Redis, без бази та серіалізації.
+
+    Перший рівень — LRU у пам'яті процесу, другий — Redis.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local: "OrderedDict[str, Tuple[float, bytes, Dict[str, str]]]" = OrderedDict()
+
+    async def version(self, user_id: int) -> Optional[str]:
+        """Поточна версія даних користувача або None, якщо Redis недоступний."""
+        try:
+            return await get_redis_client().get(f"{VERSION_PREFIX}{user_id}") or "0"
+        except RedisError as e:
+            logger.warning(f"Response cache version read failed: {str(e)}")
+            return None
+
+    async def bump(self, user_id: int) -> None:
+        """Робить недійсними всі закешовані відповіді користувача. Викликати після commit."""
+        cache_bumps.inc()
+        try:
+            await get_redis_client().incr(f"{VERSION_PREFIX}{user_id}")
+        except RedisError as e:
+            logger.warning(f"Response cache version bump failed: {str(e)}")
+
+    def _get_local(self, key: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, body, headers = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return body, headers
+
+    def _set_local(self, key: str, body: bytes, headers: Dict[str, str]) -> None:
+        self._local[key] = (time.monotonic() + self.ttl, body, headers)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def _get_redis(self, key: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        try:
+            entry = await get_redis_client().hgetall(f"{ENTRY_PREFIX}{key}")
+        except RedisError as e:
+            logger.warning(f"Response cache Redis read failed: {str(e)}")
+            return None
+        if not entry:
+            return None
+        return entry["body"].encode(), json.loads(entry["headers"])
+
+    async def _set_redis(self, key: str, body: bytes, headers: Dict[str, str]) -> None:
+        try:
+            async with get_redis_client().pipeline(transaction=True) as pipe:
+                pipe.hset(f"{ENTRY_PREFIX}{key}", mapping={
+                    "body": body.decode(),
+                    "headers": json.dumps(headers),
+                })
+                pipe.expire(f"{ENTRY_PREFIX}{key}", self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Response cache Redis write failed: {str(e)}")
+
+    async def respond(
+        self,
+        request: Request,
+        user_id: int,
+        route: str,
+        params: Mapping[str, Any],
+        loader: Loader,
+    ) -> Response:
+        """
+        Повертає відповідь з кешу, 304 для актуального If-None-Match
+        або результат loader(), який після цього кешується.
+        """
+        version = await self.version(user_id) if settings.response_cache_enabled else None
+        if version is None:
+            cache_requests.inc(route=route, result="bypass")
+            body, headers = await loader()
+            return Response(body, media_type="application/json", headers=headers)
+
+        raw_params = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha256(f"{user_id}:{version}:{route}:{raw_params}".encode()).hexdigest()
+        etag = f'W/"{digest[:32]}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if _etag_matches(request.headers.get("If-None-Match"), etag):
+            cache_requests.inc(route=route, result="not_modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        key = f"{user_id}:{digest}"
+        cached = self._get_local(key)
+        if cached is not None:
+            cache_requests.inc(route=route, result="local_hit")
+        else:
+            cached = await self._get_redis(key)
+            if cached is not None:
+                cache_requests.inc(route=route, result="redis_hit")
+                self._set_local(key, *cached)
+
+        if cached is None:
+            cache_requests.inc(route=route, result="miss")
+            body, headers = await loader()
+            self._set_local(key, body, headers)
+            await self._set_redis(key, body, headers)
+        else:
+            body, headers = cached
+
+        return Response(body, media_type="application/json", headers={**headers, **cache_headers})
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+response_cache = ResponseCache(
+    max_size=settings.response_cache_max_size,
+    ttl=settings.response_cache_ttl_seconds,
+)
@@ -0,0 +1,214 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.database.models import Contact
+from app.src.repository.read_models import select_model, to_models
+
+# Поля контакту, за якими виконується пошук. На Postgres для них є
+# GIN-індекси (tsvector та pg_trgm), створені міграцією e5f9a3c7b1d2.
+SEARCH_FIELDS = ("first_name", "last_name", "email")
+TS_CONFIG = literal_column("'simple'::regconfig")
+NGRAM_SIZE = 3
+
+_token_re = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value: str) -> List[str]:
+    return _token_re.findall(value.lower())
+
+
+def ngrams(value: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """Триграми рядка з доповненням по краях, як у pg_trgm."""
+    grams: Set[str] = set()
+    for token in tokenize(value):
+        padded = f"  {token} "
+        grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _document(contact_fields: Iterable[str]) -> str:
+    return " ".join(value for value in contact_fields if value)
+
+
+# --- Postgres ---------------------------------------------------------------
+
+def search_vector():
+    """
+    Вираз tsvector; має збігатися з виразом індексу ix_contacts_search_tsv.
+    """
+    # Константи вставляються в SQL буквально: з bind-параметрами планувальник
+    # не зіставить вираз з індексом.
+    empty, space = literal_column("''"), literal_column("' '")
+    document = func.coalesce(getattr(Contact, SEARCH_FIELDS[0]), empty)
+    for field in SEARCH_FIELDS[1:]:
+        document = document + space + func.coalesce(getattr(Contact, field), empty)
+    return func.to_tsvector(TS_CONFIG, document)
+
+
+def _ts_query(tokens: List[str], prefix: bool) -> str:
+    suffix = ":*" if prefix else ""
+    return " & ".join(f"{token}{suffix}" for token in tokens)
+
+
+async def _search_postgres(
+    db: AsyncSession, query: str, user_id: int, prefix: bool, limit: int, read_model
+) -> List[Contact]:
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    vector = search_vector()
+    ts_query = func.to_tsquery(TS_CONFIG, _ts_query(tokens, prefix))
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"{escaped}%" if prefix else f"%{escaped}%"
+
+    rank = func.ts_rank(vector, ts_query) + func.greatest(
+        *(func.similarity(getattr(Contact, field), query) for field in SEARCH_FIELDS)
+    )
+    stmt = (
+        (select_model(read_model) if read_model else select(Contact))
+        .where(
+            Contact.user_id == user_id,
+            or_(
+                vector.op("@@")(ts_query),
+                *(getattr(Contact, field).ilike(pattern, escape="\\") for field in SEARCH_FIELDS),
+            ),
+        )
+        .order_by(rank.desc(), Contact.id)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return to_models(read_model, result.all()) if read_model else result.scalars().all()
+
+
+# --- Pure-Python fallback ---------------------------------------------------
+
+class NgramIndex:
+    """
+    Інвертований індекс триграм у пам'яті для одного користувача.
+
+    Використовується там, де немає pg_trgm (SQLite у тестах та локально).
+    """
+
+    def __init__(self):
+        self.documents: Dict[int, str] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+
+    def add(self, contact_id: int, document: str) -> None:
+        self.documents[contact_id] = document.lower()
+        for gram in ngrams(document):
+            self.postings[gram].add(contact_id)
+
+    def search(self, query: str, prefix: bool = False, limit: int = 20) -> List[int]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        query_grams = ngrams(query)
+        if prefix:
+            # Для typeahead останній токен ще недописаний: без правого доповнення.
+            query_grams = {gram for gram in query_grams if not gram.endswith(" ")}
+
+        scores: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for contact_id in self.postings.get(gram, ()):
+                scores[contact_id] += 1
+        if not prefix and any(len(t) < NGRAM_SIZE for t in tokens):
+            # Короткий підрядок може не мати спільних триграм з документом.
+            for contact_id in self.documents:
+                scores.setdefault(contact_id, 0)
+
+        ranked: List[Tuple[float, int]] = []
+        for contact_id, shared in scores.items():
+            words = tokenize(self.documents[contact_id])
+            if prefix:
+                matched = all(any(word.startswith(t) for word in words) for t in tokens)
+            else:
+                matched = all(t in self.documents[contact_id] for t in tokens)
+            if not matched:
+                continue
+            ranked.append((shared / len(query_grams), contact_id))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [contact_id for _, contact_id in ranked[:limit]]
+
+
+_indexes: Dict[int, NgramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def invalidate_index(user_id: int) -> None:
+    with _indexes_lock:
+        _indexes.pop(user_id, None)
+
+
+async def _get_index(db: AsyncSession, user_id: int) -> NgramIndex:
+    index = _indexes.get(user_id)
+    if index is not None:
+        return index
+
+    columns = [getattr(Contact, field) for field in SEARCH_FIELDS]
+    result = await db.execute(
+        select(Contact.id, *columns).where(Contact.user_id == user_id)
+    )
+    index = NgramIndex()
+    for contact_id, *values in result.all():
+        index.add(contact_id, _document(values))
+    with _indexes_lock:
+        _indexes[user_id] = index
+    return index
+
+
+async def _search_in_memory(
+    db: AsyncSession, query: str, user_id: int, prefix: bool, limit: int, read_model
+) -> List[Contact]:
+    index = await _get_index(db, user_id)
+    ids = index.search(query, prefix=prefix, limit=limit)
+    if not ids:
+        return []
+    if read_model:
+        # Перше поле моделі читання — Contact.id.
+        result = await db.execute(select_model(read_model).where(Contact.id.in_(ids)))
+        by_id = {row.id: row for row in to_models(read_model, result.all())}
+    else:
+        result = await db.execute(select(Contact).where(Contact.id.in_(ids)))
+        by_id = {contact.id: contact for contact in result.scalars().all()}
+    return [by_id[contact_id] for contact_id in ids if contact_id in by_id]
+
+
+@event.listens_for(Contact, "after_insert")
+@event.listens_for(Contact, "after_update")
+@event.listens_for(Contact, "after_delete")
+def _on_contact_change(mapper, connection, target):
+    if target.user_id is not None:
+        invalidate_index(target.user_id)
+
+
+# --- Public API -------------------------------------------------------------
+
+async def search_contacts(
+    db: AsyncSession,
+    query: str,
+    user_id: int,
+    prefix: bool = False,
+    limit: int = 20,
+    read_model: Optional[type] = None,
+) -> List[Contact]:
+    """
+    Ранжований пошук контактів користувача.
+
+    На Postgres використовує tsvector та pg_trgm, на інших СУБД —
+    індекс триграм у пам'яті процесу. З read_model повертає її
+    кортежі замість ORM-об'єктів.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return await _search_postgres(db, query, user_id, prefix, limit, read_model)
+    return await _search_in_memory(db, query, user_id, prefix, limit, read_model)
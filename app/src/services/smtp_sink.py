@@ -0,0 +1,104 @@
+import asyncio
+import base64
+from email import message_from_bytes
+from email.message import Message
+from typing import List, Optional
+
+
+class SMTPSink:
+    """
+    Мінімальний локальний SMTP-сервер, що приймає й зберігає листи в пам'яті.
+
+    Замінює справжній поштовий сервер у тестах і локальній розробці:
+
+        async with SMTPSink() as sink:
+            settings.mail_server, settings.mail_port = sink.host, sink.port
+            ...
+            assert sink.messages[0]["To"] == "user@example.com"
+
+    STARTTLS не підтримується, тому mail_starttls має бути вимкнено.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.messages: List[Message] = []
+        self.logins: List[str] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "SMTPSink":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "SMTPSink":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-sink ESMTP ready")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode(errors="replace").rstrip("\r\n")
+                command = line[:4].upper()
+
+                if command == "EHLO":
+                    writer.write(b"250-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                    await writer.drain()
+                elif command == "HELO":
+                    await reply("250 smtp-sink")
+                elif command == "AUTH":
+                    parts = line.split()
+                    mechanism = parts[1].upper() if len(parts) > 1 else ""
+                    if mechanism == "PLAIN":
+                        credentials = parts[2] if len(parts) > 2 else None
+                        if credentials is None:
+                            await reply("334 ")
+                            credentials = (await reader.readline()).decode().strip()
+                        self.logins.append(base64.b64decode(credentials).split(b"\0")[1].decode())
+                    elif mechanism == "LOGIN":
+                        await reply("334 VXNlcm5hbWU6")
+                        username = (await reader.readline()).decode().strip()
+                        await reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                        self.logins.append(base64.b64decode(username).decode())
+                    else:
+                        await reply("504 Unrecognized authentication type")
+                        continue
+                    await reply("235 Authentication successful")
+                elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        data_line = await reader.readline()
+                        if data_line in (b".\r\n", b".\n", b""):
+                            break
+                        if data_line.startswith(b".."):
+                            data_line = data_line[1:]
+                        lines.append(data_line)
+                    self.messages.append(message_from_bytes(b"".join(lines)))
+                    await reply("250 OK: queued")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
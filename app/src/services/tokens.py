@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError, PyJWTError
+
+__all__ = [
+    "TokenService",
+    "get_token_service",
+    "ExpiredSignatureError",
+    "InvalidTokenError",
+    "PyJWTError",
+]
+
+
+class TokenService:
+    """
+    Створення та перевірка JWT (PyJWT) з LRU-кешем перевірених токенів.
+
+    Ключ кешу — SHA-256 токена, тож самі токени в пам'яті не зберігаються.
+    Запис живе до exp токена (але не довше за max_ttl); прострочений токен
+    з кешу відкидається з ExpiredSignatureError, як і при повній перевірці.
+    """
+
+    def __init__(self, secret: str, algorithm: str, cache_size: int = 4096, max_ttl: float = 300):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.max_ttl = max_ttl
+        self._cache: "OrderedDict[bytes, Tuple[float, Optional[float], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, claims: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+        payload = dict(claims)
+        if expires_delta is not None:
+            payload["exp"] = datetime.now(timezone.utc) + expires_delta
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Повертає claims перевіреного токена.
+
+        Raises:
+            ExpiredSignatureError: термін дії токена минув
+            InvalidTokenError: підпис або формат токена некоректні
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                cached_until, exp, claims = entry
+                if exp is not None and exp <= now:
+                    del self._cache[key]
+                    raise ExpiredSignatureError("Signature has expired")
+                if cached_until > now:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return dict(claims)
+                del self._cache[key]
+
+        self.misses += 1
+        claims = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        exp = claims.get("exp")
+        cached_until = now + self.max_ttl
+        if exp is not None:
+            cached_until = min(cached_until, float(exp))
+
+        with self._lock:
+            self._cache[key] = (cached_until, exp, claims)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+@lru_cache(maxsize=1)
+def get_token_service() -> TokenService:
+    from app.src.config.config import settings
+    from app.src.monitoring.metrics import registry
+
+    service = TokenService(
+        secret=settings.secret_key,
+        algorithm=settings.jwt_algorithm,
+        cache_size=settings.token_cache_size,
+        max_ttl=settings.token_cache_ttl_seconds,
+    )
+    registry.gauge(
+        "token_cache_hits",
+        "Перевірки JWT, обслужені з кешу",
+        callback=lambda: service.hits
+    )
+    registry.gauge(
+        "token_cache_misses",
+        "Перевірки JWT з повною перевіркою підпису",
+        callback=lambda: service.misses
+    )
+    return service
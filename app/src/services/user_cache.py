@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.src.config.config import settings
+from app.src.database.models import User
+from app.src.database.redis import get_redis_client
+from app.src.monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Поля користувача, які кешуються. Хеш пароля навмисно не зберігається.
+CACHED_FIELDS = ("id", "email", "confirmed", "avatar")
+
+cache_requests = registry.counter(
+    "user_cache_requests_total",
+    "Звернення до кешу автентифікованих користувачів",
+    labelnames=("layer", "result"),
+)
+cache_invalidations = registry.counter(
+    "user_cache_invalidations_total",
+    "Кількість явних інвалідацій кешу користувачів",
+)
+
+
+class UserCache:
+    """
+    Кеш автентифікованих користувачів за subject токена.
+
+    Перший рівень — LRU у пам'яті процесу з TTL, другий — Redis.
+    Інвалідація публікується в канал Redis, і кожен воркер, що слухає
+    його (start()), видаляє запис зі свого першого рівня, не чекаючи TTL.
+    """
+
+    def __init__(self, max_size: int, ttl: int, prefix: str = "user:principal:"):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidate"
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    def _redis_key(self, subject: str) -> str:
+        return f"{self.prefix}{subject}"
+
+    def _get_local(self, subject: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(subject)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            self._local.pop(subject, None)
+            return None
+        self._local.move_to_end(subject)
+        return data
+
+    def _set_local(self, subject: str, data: Dict[str, Any]) -> None:
+        self._local[subject] = (time.monotonic() + self.ttl, data)
+        self._local.move_to_end(subject)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        data = self._get_local(subject)
+        if data is not None:
+            cache_requests.inc(layer="local", result="hit")
+            return data
+        cache_requests.inc(layer="local", result="miss")
+
+        try:
+            raw = await get_redis_client().get(self._redis_key(subject))
+        except RedisError as e:
+            logger.warning(f"User cache Redis read failed: {str(e)}")
+            raw = None
+        if raw is None:
+            cache_requests.inc(layer="redis", result="miss")
+            return None
+
+        cache_requests.inc(layer="redis", result="hit")
+        data = json.loads(raw)
+        self._set_local(subject, data)
+        return data
+
+    async def set(self, subject: str, user: User) -> None:
+        data = {field: getattr(user, field) for field in CACHED_FIELDS}
+        self._set_local(subject, data)
+        try:
+            await get_redis_client().set(self._redis_key(subject), json.dumps(data), ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"User cache Redis write failed: {str(e)}")
+
+    async def invalidate(self, subject: str) -> None:
+        """Видаляє користувача з обох рівнів кешу після його зміни."""
+        cache_invalidations.inc()
+        self._local.pop(subject, None)
+        try:
+            redis_client = get_redis_client()
+            await redis_client.delete(self._redis_key(subject))
+            await redis_client.publish(self.channel, subject)
+        except RedisError as e:
+            logger.warning(f"User cache Redis invalidation failed: {str(e)}")
+
+    async def _listen(self, subscribed: asyncio.Event) -> None:
+        while True:
+            try:
+                async with get_redis_client().pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Поки підписки не було, інвалідації могли загубитися.
+                    self.clear_local()
+                    subscribed.set()
+                    while True:
+                        # Блокуюче читання обірвав би socket_timeout пулу, тож
+                        # повідомлення чекаються з власним тайм-аутом.
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            self._local.pop(message["data"], None)
+            except RedisError as e:
+                logger.warning(f"User cache invalidation channel failed: {str(e)}")
+                self.clear_local()
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        """Підписка на інвалідації інших воркерів; викликати в lifespan."""
+        if self._listener is not None:
+            return
+        subscribed = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen(subscribed))
+        try:
+            await asyncio.wait_for(subscribed.wait(), settings.redis_socket_timeout)
+        except asyncio.TimeoutError:
+            # Слухач продовжує спроби у фоні, старт застосунку не блокується.
+            logger.warning("User cache invalidation channel is not subscribed yet")
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "size": len(self._local),
+            "local_hits": cache_requests.value(layer="local", result="hit"),
+            "local_misses": cache_requests.value(layer="local", result="miss"),
+            "redis_hits": cache_requests.value(layer="redis", result="hit"),
+            "redis_misses": cache_requests.value(layer="redis", result="miss"),
+            "invalidations": cache_invalidations.value(),
+        }
+
+
+async def attach_cached_user(data: Dict[str, Any], db: AsyncSession) -> User:
+    """
+    Відновлює User з кешу та приєднує його до сесії без запиту до бази.
+
+    Екземпляр неповний: завантажені лише CACHED_FIELDS. Колонка password
+    відкладена з raiseload, тож читання user.password кидає
+    InvalidRequestError; присвоєння нового хеша працює.
+    """
+    user = User(**data)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+user_cache = UserCache(
+    max_size=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl_seconds,
+)
+
+registry.gauge(
+    "user_cache_local_size",
+    "Кількість записів у локальному кеші користувачів",
+    callback=lambda: len(user_cache._local),
+)
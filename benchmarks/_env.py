@@ -0,0 +1,44 @@
+"""
+Налаштування застосунку для запусків без .env: тестів і бенчмарків.
+
+Settings читаються під час імпорту app, тож ці функції викликаються до
+першого імпорту застосунку. Значення, вже задані в оточенні, не
+змінюються.
+"""
+import os
+from typing import Dict, MutableMapping, Optional
+
+# Обов'язкові налаштування, які тести й бенчмарки не використовують.
+STUBBED = (
+    "secret_key", "mail_server", "mail_username", "mail_password", "cloud_name",
+    "cloud_api_key", "cloud_api_secret", "allowed_origins", "frontend_url",
+)
+
+
+def database_settings(url: str) -> Dict[str, str]:
+    """URL-и бази для async URL: синхронний отримує драйвер за замовчуванням."""
+    return {
+        "DATABASE_URL": url,
+        "ASYNC_DATABASE_URL": url,
+        "SYNC_DATABASE_URL": url.replace("+aiosqlite", "").replace("+asyncpg", "+psycopg2"),
+    }
+
+
+def stub_settings(
+    env: Optional[MutableMapping[str, str]] = None,
+    database_url: str = "sqlite+aiosqlite://",
+) -> MutableMapping[str, str]:
+    """Заповнює відсутні обов'язкові налаштування в env (за замовчуванням os.environ)."""
+    env = os.environ if env is None else env
+    for name, value in database_settings(database_url).items():
+        env.setdefault(name, value)
+    for name in STUBBED:
+        env.setdefault(name.upper(), "stub-" + name.replace("_", "-") + "-value-32-bytes")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    env.setdefault("MAIL_FROM", "stub@example.com")
+    env.setdefault("MAIL_PORT", "25")
+    env.setdefault("MAIL_STARTTLS", "false")
+    env.setdefault("MAIL_SSL_TLS", "false")
+    env.setdefault("REDIS_URL", "redis://localhost:6379/0")
+    return env
@@ -0,0 +1,72 @@
+"""
+Мікробенчмарк вартості автентифікації одного запиту.
+
+Порівнює повну перевірку JWT (python-jose, як було раніше, та PyJWT)
+з TokenService, де повторний запит з тим самим токеном обслуговується
+з LRU-кешу перевірених claims.
+
+Запуск:
+    python benchmarks/auth_tokens.py [--iterations 20000]
+"""
+import argparse
+import sys
+import timeit
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import jwt  # noqa: E402
+
+from app.src.services.tokens import TokenService  # noqa: E402
+
+SECRET = "benchmark-secret-key-benchmark-secret-key"
+ALGORITHM = "HS256"
+
+
+def run(name: str, func, iterations: int) -> float:
+    func()
+    seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+    per_call = seconds / iterations * 1e6
+    print(f"{name:<38} {per_call:8.2f} µs/request")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    service = TokenService(SECRET, ALGORITHM)
+    token = service.encode({"sub": "user@example.com"}, timedelta(hours=1))
+
+    print(f"{args.iterations} iterations, best of 3\n")
+    results = {}
+    try:
+        from jose import jwt as jose_jwt
+
+        results["before"] = run(
+            "python-jose decode (before)",
+            lambda: jose_jwt.decode(token, SECRET, algorithms=[ALGORITHM]),
+            args.iterations,
+        )
+    except ImportError:
+        print(f"{'python-jose decode (before)':<38}  not installed, skipped")
+
+    results["pyjwt"] = run(
+        "PyJWT decode, no cache",
+        lambda: jwt.decode(token, SECRET, algorithms=[ALGORITHM]),
+        args.iterations,
+    )
+    results["cached"] = run(
+        "TokenService.decode, cache hit (after)",
+        lambda: service.decode(token),
+        args.iterations,
+    )
+
+    baseline = results.get("before", results["pyjwt"])
+    print(f"\nspeed-up vs baseline: {baseline / results['cached']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Бенчмарк серіалізації сторінки контактів.
+
+Порівнює шляхи відповіді для GET /contacts:
+  * ORM-об'єкти + response_model (валідація pydantic і json.dumps, як
+    FastAPI робить за замовчуванням);
+  * ORM-об'єкти + TypeAdapter.dump_json;
+  * кортежі рядків + orjson (fast_json, вмикається через fast_json_routes).
+
+Кожна ітерація включає запит до SQLite у пам'яті, тож враховано і
+вартість побудови ORM-об'єктів. Результат — контакти за секунду.
+
+Запуск:
+    python benchmarks/contacts_json.py [--contacts 200] [--iterations 200]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks._env import stub_settings  # noqa: E402
+
+# Налаштування-заглушки, щоб імпортувати застосунок без .env.
+stub_settings()
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.src.database.base import Base  # noqa: E402
+from app.src.database.models import Contact, User, birthday_key  # noqa: E402
+from app.src.repository.contacts import get_contacts  # noqa: E402
+from app.src.repository.read_models import ContactRow  # noqa: E402
+from app.src.schemas import ContactResponse  # noqa: E402
+from app.src.services import fast_json  # noqa: E402
+
+adapter = TypeAdapter(List[ContactResponse])
+
+
+async def seed(session_factory, count: int) -> None:
+    async with session_factory() as db:
+        db.add(User(id=1, email="bench@example.com", password="x", confirmed=True))
+        await db.flush()
+        start = date(1990, 1, 1)
+        await db.execute(insert(Contact), [
+            {
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": f"contact{i}@example.com",
+                "phone_number": f"+380{i:09d}",
+                "birthday": start + timedelta(days=i),
+                "birthday_mmdd": birthday_key(start + timedelta(days=i)),
+                "user_id": 1,
+            }
+            for i in range(count)
+        ])
+        await db.commit()
+
+
+async def response_model_path(db: AsyncSession, limit: int) -> bytes:
+    contacts = await get_contacts(db, 1, limit=limit)
+    content = adapter.dump_python(adapter.validate_python(contacts), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def type_adapter_path(db: AsyncSession, limit: int) -> bytes:
+    contacts = await get_contacts(db, 1, limit=limit)
+    return adapter.dump_json(adapter.validate_python(contacts))
+
+
+async def fast_json_path(db: AsyncSession, limit: int) -> bytes:
+    rows = await get_contacts(db, 1, limit=limit, read_model=ContactRow)
+    return fast_json.dump_contacts(rows)
+
+
+async def run(name: str, func, session_factory, limit: int, iterations: int):
+    async with session_factory() as db:
+        expected = await func(db, limit)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        # Нова сесія на ітерацію, як і на запит: identity map не використовується повторно.
+        async with session_factory() as db:
+            await func(db, limit)
+    elapsed = time.perf_counter() - start
+    rate = limit * iterations / elapsed
+    print(f"{name:<34} {rate:12,.0f} contacts/s  {elapsed / iterations * 1000:7.2f} ms/page")
+    return rate, json.loads(expected)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=200, help="contacts per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await seed(session_factory, args.contacts)
+
+    print(f"{args.contacts} contacts per page, {args.iterations} pages")
+    before, before_body = await run(
+        "ORM + response_model + json", response_model_path, session_factory,
+        args.contacts, args.iterations
+    )
+    await run("ORM + TypeAdapter.dump_json", type_adapter_path, session_factory, args.contacts, args.iterations)
+    after, after_body = await run(
+        "rows + orjson (fast_json)", fast_json_path, session_factory,
+        args.contacts, args.iterations
+    )
+    assert before_body == after_body, "fast path output differs from response_model output"
+    print(f"speed-up: {after / before:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
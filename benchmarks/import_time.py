@@ -0,0 +1,121 @@
+"""
+Перевірка часу імпорту застосунку (холодний старт воркера).
+
+Кілька разів запускає `python -X importtime -c "import app.main"` в
+окремих процесах і бере медіану сумарного (cumulative) часу імпорту
+app.main за звітом importtime: старт інтерпретатора і site не
+враховуються. Завершується з
+кодом 1, якщо медіана перевищує бюджет (--budget-ms) або якщо під час
+старту імпортується модуль, який має завантажуватися ліниво: Pillow,
+Cloudinary, aiosmtplib і passlib потрібні лише першому запиту чи
+воркеру пошти, а не кожному старту процесу.
+
+У stderr виводяться модулі з найбільшим власним часом імпорту, щоб
+було видно, що саме додало регресію.
+
+Запуск:
+    python benchmarks/import_time.py [--budget-ms 1500] [--runs 5] [--top 15]
+
+Ті самі перевірки виконує tests/test_import_time.py.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks._env import stub_settings  # noqa: E402
+
+MODULE = "app.main"
+BUDGET_MS = 1500
+# Модулі верхнього рівня, які не мають імпортуватися під час старту.
+LAZY_MODULES = ("PIL", "cloudinary", "aiosmtplib", "passlib", "jose")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="maximum median import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="modules to list by self time")
+    parser.add_argument("--module", default=MODULE)
+    return parser.parse_args()
+
+
+def environment() -> Dict[str, str]:
+    """Налаштування читаються під час імпорту; відсутні значення заповнюються заглушками."""
+    env = dict(os.environ)
+    stub_settings(env, database_url="sqlite+aiosqlite:///:memory:")
+    return env
+
+
+def measure(module: str, env: Dict[str, str]) -> List[Tuple[str, int, int]]:
+    """Один холодний імпорт: (модуль, власний час мкс, сумарний час мкс) у порядку імпорту."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def cumulative_ms(rows: List[Tuple[str, int, int]], module: str) -> float:
+    """Сумарний час імпорту module разом з усім, що він імпортував, у мс."""
+    return next(cumulative_us for name, _, cumulative_us in rows if name.strip() == module) / 1000
+
+
+def measure_runs(module: str, runs: int) -> Tuple[List[float], List[Tuple[str, int, int]]]:
+    """Час імпорту module в кожному прогоні в мс і рядки прогону з медіанним часом."""
+    env = environment()
+    # Перший прогін компілює байткод і не враховується.
+    measure(module, env)
+    measured = [measure(module, env) for _ in range(max(runs, 1))]
+    totals = [cumulative_ms(rows, module) for rows in measured]
+    median_run = measured[totals.index(sorted(totals)[len(totals) // 2])]
+    return totals, median_run
+
+
+def eager_modules(rows: List[Tuple[str, int, int]]) -> List[str]:
+    """Модулі з LAZY_MODULES, імпортовані під час старту."""
+    imported = {name.strip().split(".")[0] for name, _, _ in rows}
+    return sorted(imported.intersection(LAZY_MODULES))
+
+
+def main() -> int:
+    args = parse_args()
+    totals, median_run = measure_runs(args.module, args.runs)
+    total_ms = statistics.median(totals)
+
+    print(f"{'module':<60} {'self ms':>9} {'cum ms':>9}", file=sys.stderr)
+    for name, self_us, cumulative_us in sorted(median_run, key=lambda row: -row[1])[:args.top]:
+        print(f"{name.strip():<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}", file=sys.stderr)
+
+    failures = []
+    eager = eager_modules(median_run)
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    print(
+        f"import {args.module}: median {total_ms:.0f} ms over {len(totals)} runs "
+        f"(min {min(totals):.0f}, max {max(totals):.0f}), budget {args.budget_ms:.0f} ms"
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
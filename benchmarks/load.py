@@ -0,0 +1,376 @@
+"""
+Навантажувальний бенчмарк Contacts API.
+
+Піднімає застосунок у процесі (httpx.ASGITransport, без мережі й
+uvicorn) з тимчасовою SQLite або вказаною PostgreSQL і fakeredis
+замість Redis, засіває users × contacts і для кожного сценарію вимірює
+p50/p95/p99 затримки та запити за секунду. Життєвий цикл застосунку
+(прогрів пулів тощо) виконується так само, як у продакшні.
+
+Сценарії: login, me, list, search, birthdays, create, update, delete
+(update і delete працюють з контактами, створеними сценарієм create).
+
+Результат — JSON у stdout або у файл (--output); таблиця — у stderr.
+З --baseline попередній JSON порівнюється з поточним прогоном.
+
+Запуск:
+    python benchmarks/load.py [--users 20] [--contacts 200] [--requests 500]
+        [--concurrency 16] [--scenarios list,search] [--output run.json]
+        [--baseline previous.json] [--database-url postgresql+asyncpg://...]
+
+Увага: база з --database-url очищається (drop_all/create_all), тож
+вказуйте лише окрему тестову базу. Потрібні httpx і fakeredis
+(pip install httpx fakeredis).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks._env import database_settings, stub_settings  # noqa: E402
+
+SCENARIOS = ("login", "me", "list", "search", "birthdays", "create", "update", "delete")
+# Без контактів від create сценаріям update і delete нема з чим працювати.
+DEPENDS_ON = {"update": "create", "delete": "create"}
+PASSWORD = "benchmark-password"
+FIRST_NAMES = ("Olena", "Andrii", "Iryna", "Taras", "Mariia", "Petro", "Sofiia", "Dmytro")
+LAST_NAMES = ("Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Melnyk")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--contacts", type=int, default=200, help="contacts per user")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--database-url", help="async URL of a disposable database; default: temporary SQLite")
+    parser.add_argument("--bcrypt-rounds", type=int, help="override BCRYPT_ROUNDS for login")
+    parser.add_argument("--no-response-cache", action="store_true")
+    parser.add_argument("--rate-limits", action="store_true", help="keep rate limiting enabled")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON result to compare with")
+    args = parser.parse_args()
+    selected = set(args.scenarios.split(","))
+    unknown = selected - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    for name in selected:
+        required = DEPENDS_ON.get(name)
+        if required and required not in selected:
+            parser.error(f"scenario {name} requires {required}")
+    return args
+
+
+def configure_environment(args: argparse.Namespace, database_url: str) -> None:
+    """Налаштування застосунку читаються під час імпорту, тож задаються до нього."""
+    os.environ.update({
+        **database_settings(database_url),
+        "RATE_LIMIT_ENABLED": str(args.rate_limits).lower(),
+        "RESPONSE_CACHE_ENABLED": str(not args.no_response_cache).lower(),
+        "DB_POOL_SIZE": str(max(args.concurrency, 5)),
+    })
+    if args.bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    stub_settings()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@dataclass
+class State:
+    """Дані засіву, спільні для сценаріїв."""
+    emails: List[str]
+    tokens: List[str]
+    created: List[Tuple[int, int]] = field(default_factory=list)
+
+    def headers(self, user: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[user]}"}
+
+
+Step = Callable[[Any, State, int], Awaitable[Any]]
+
+
+async def login(client, state: State, i: int):
+    user = i % len(state.emails)
+    return await client.post(
+        "/auth/auth/login", data={"username": state.emails[user], "password": PASSWORD}
+    )
+
+
+async def me(client, state: State, i: int):
+    return await client.get("/auth/auth/me", headers=state.headers(i % len(state.tokens)))
+
+
+async def list_contacts(client, state: State, i: int):
+    return await client.get("/contacts/?limit=50", headers=state.headers(i % len(state.tokens)))
+
+
+async def search(client, state: State, i: int):
+    query = FIRST_NAMES[i % len(FIRST_NAMES)]
+    return await client.get(
+        f"/contacts/search/?query={query}", headers=state.headers(i % len(state.tokens))
+    )
+
+
+async def birthdays(client, state: State, i: int):
+    return await client.get(
+        "/contacts/upcoming_birthdays/?days=30", headers=state.headers(i % len(state.tokens))
+    )
+
+
+async def create(client, state: State, i: int):
+    user = i % len(state.tokens)
+    response = await client.post("/contacts/", headers=state.headers(user), json={
+        "first_name": FIRST_NAMES[i % len(FIRST_NAMES)],
+        "last_name": LAST_NAMES[i % len(LAST_NAMES)],
+        "email": f"created{i}@load.example.com",
+        "phone_number": f"+380{i:09d}",
+        "birthday": "1990-06-15",
+    })
+    if response.status_code == 201:
+        state.created.append((user, response.json()["id"]))
+    return response
+
+
+async def update(client, state: State, i: int):
+    user, contact_id = state.created[i % len(state.created)]
+    return await client.put(
+        f"/contacts/{contact_id}", headers=state.headers(user),
+        json={"additional_info": f"updated {i}"}
+    )
+
+
+async def delete(client, state: State, i: int):
+    user, contact_id = state.created[i]
+    return await client.delete(f"/contacts/{contact_id}", headers=state.headers(user))
+
+
+STEPS: Dict[str, Step] = {
+    "login": login,
+    "me": me,
+    "list": list_contacts,
+    "search": search,
+    "birthdays": birthdays,
+    "create": create,
+    "update": update,
+    "delete": delete,
+}
+
+
+async def seed(users: int, contacts: int) -> State:
+    from sqlalchemy import insert
+
+    from app.src.database.base import AsyncSessionLocal, Base, engine
+    from app.src.database.models import Contact, User, birthday_key
+    from app.src.services.auth import create_access_token
+    from app.src.services.passwords import password_hasher
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    password_hash = await password_hasher.hash(PASSWORD)
+    emails = [f"user{u}@load.example.com" for u in range(users)]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": u + 1, "email": email, "password": password_hash, "confirmed": True}
+            for u, email in enumerate(emails)
+        ])
+        rows = []
+        for u in range(users):
+            for j in range(contacts):
+                birthday = date(1970 + j % 40, 1, 1) + timedelta(days=(j * 37) % 365)
+                rows.append({
+                    "first_name": FIRST_NAMES[j % len(FIRST_NAMES)],
+                    "last_name": LAST_NAMES[(j // len(FIRST_NAMES)) % len(LAST_NAMES)],
+                    "email": f"contact{j}@user{u}.example.com",
+                    "phone_number": f"+380{j:09d}",
+                    "birthday": birthday,
+                    "birthday_mmdd": birthday_key(birthday),
+                    "user_id": u + 1,
+                })
+        for start in range(0, len(rows), 1000):
+            await db.execute(insert(Contact), rows[start:start + 1000])
+        await db.commit()
+
+    tokens = [
+        create_access_token({"sub": email}, expires_delta=timedelta(hours=1))
+        for email in emails
+    ]
+    return State(emails=emails, tokens=tokens)
+
+
+def disable_route_rate_limits(app) -> None:
+    """Вимикає ліміти fastapi-limiter на маршрутах (наприклад, 5/хв на /auth/me)."""
+    from fastapi.routing import APIRoute
+    from fastapi_limiter.depends import RateLimiter
+
+    async def no_limit():
+        return None
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            for dependency in route.dependant.dependencies:
+                if isinstance(dependency.call, RateLimiter):
+                    app.dependency_overrides[dependency.call] = no_limit
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict[str, Any]:
+    ms = sorted(value * 1000 for value in latencies)
+    if len(ms) >= 2:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "requests": len(ms),
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+    }
+
+
+async def run_scenario(
+    client, state: State, step: Step, warmup: int, total: int, concurrency: int
+) -> Dict[str, Any]:
+    # Індекси наскрізні для прогріву й вимірювання, щоб create не повторював email-и,
+    # а delete не видаляв той самий контакт двічі.
+    indexes = itertools.count()
+
+    async def worker(limit: int, latencies: Optional[List[float]], statuses: Counter):
+        while True:
+            i = next(indexes)
+            if i >= limit:
+                return
+            start = time.perf_counter()
+            response = await step(client, state, i)
+            if latencies is not None:
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+    await asyncio.gather(*(worker(warmup, None, Counter()) for _ in range(concurrency)))
+    indexes = itertools.count(warmup)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(warmup + total, latencies, statuses) for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    if baseline:
+        header += f" {'Δ req/s':>9} {'Δ p95':>8}"
+    print(header, file=sys.stderr)
+    for name, result in results.items():
+        line = (
+            f"{name:<10} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} "
+            f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and previous["rps"] and previous["p95_ms"]:
+            line += (
+                f" {(result['rps'] / previous['rps'] - 1) * 100:>+8.1f}%"
+                f" {(result['p95_ms'] / previous['p95_ms'] - 1) * 100:>+7.1f}%"
+            )
+        print(line, file=sys.stderr)
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        import fakeredis
+        import httpx
+    except ImportError as e:
+        sys.exit(f"{e.name} is required: pip install httpx fakeredis")
+
+    from app.src.config.config import settings
+    from app.src.database import redis as redis_module
+
+    # Спільний клієнт підмінюється до старту lifespan: init_redis() його лише пінгує.
+    redis_module._redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    from app.main import app
+    from app.src.database.base import engine
+
+    if not args.rate_limits:
+        disable_route_rate_limits(app)
+
+    state = await seed(args.users, args.contacts)
+    scenarios = [name for name in SCENARIOS if name in args.scenarios.split(",")]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        for name in scenarios:
+            print(f"running {name}...", file=sys.stderr)
+            results[name] = await run_scenario(
+                client, state, STEPS[name], args.warmup, args.requests, args.concurrency
+            )
+    await engine.dispose()
+
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "users": args.users,
+            "contacts_per_user": args.contacts,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "bcrypt_rounds": settings.bcrypt_rounds,
+            "response_cache_enabled": settings.response_cache_enabled,
+            "rate_limit_enabled": settings.rate_limit_enabled,
+            "fast_json_routes": settings.fast_json_routes,
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = arguments.database_url or f"sqlite+aiosqlite:///{tmp}/load.db"
+        configure_environment(arguments, url)
+        report = asyncio.run(main(arguments))
+
+    baseline = json.loads(Path(arguments.baseline).read_text()) if arguments.baseline else None
+    print_table(report["scenarios"], baseline)
+    output = json.dumps(report, indent=2)
+    if arguments.output:
+        Path(arguments.output).write_text(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,80 @@
+"""
+Спільні фікстури тестів.
+
+Налаштування застосунку читаються під час імпорту, тому змінні оточення
+задаються тут, до першого імпорту app. Тести працюють на тимчасовій
+SQLite (або на окремій базі з TEST_DATABASE_URL — вона очищається) і
+fakeredis замість Redis, тож не потребують зовнішніх сервісів.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from benchmarks._env import database_settings, stub_settings
+
+_tmp_dir = tempfile.mkdtemp(prefix="contacts-tests-")
+_database_url = os.environ.get("TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_tmp_dir}/test.db")
+
+os.environ.update({
+    **database_settings(_database_url),
+    "RATE_LIMIT_ENABLED": "false",
+    "LOOP_LAG_MONITOR_ENABLED": "false",
+    "AVATAR_STORAGE": "local",
+    "AVATAR_LOCAL_DIR": os.path.join(_tmp_dir, "avatars"),
+    "BCRYPT_ROUNDS": "4",
+})
+stub_settings()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_tmp_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis_client():
+    """Чистий fakeredis на місці спільного клієнта застосунку."""
+    import fakeredis
+
+    from app.src.database import redis as redis_module
+
+    fake = fakeredis.FakeAsyncRedis(decode_responses=True)
+    client = redis_module.InstrumentedRedis(connection_pool=fake.connection_pool)
+    redis_module._redis_client = client
+    yield client
+    redis_module._redis_client = None
+    await client.aclose()
+
+
+@pytest.fixture
+async def db(redis_client):
+    """Сесія до порожньої схеми; локальні кеші процесу скидаються між тестами."""
+    from app.src.database.base import AsyncSessionLocal, Base, engine
+    from app.src.services import search
+    from app.src.services.user_cache import user_cache
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    search._indexes.clear()
+    user_cache.clear_local()
+    async with AsyncSessionLocal() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user(db):
+    from app.src.database.models import User
+
+    user = User(email="owner@example.com", password="not-a-hash", confirmed=True)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
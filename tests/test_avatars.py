@@ -0,0 +1,114 @@
+from datetime import timedelta
+from io import BytesIO
+from typing import Tuple
+
+import httpx
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from sqlalchemy import select
+
+from app.main import app
+from app.src.config.config import settings
+from app.src.database.models import User
+from app.src.routes import auth as auth_routes
+from app.src.services import avatars
+from app.src.services.auth import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=BytesIO(data), filename="avatar")
+
+
+def png(size=(400, 300)) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", size, "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+async def test_non_image_is_rejected_before_accepting(db, user):
+    with pytest.raises(HTTPException) as error:
+        await avatars.schedule_avatar_update(upload(b"definitely not an image"), user.id, None)
+    assert error.value.status_code == 400
+    assert await avatars.get_status(user.id) is None
+
+
+async def test_truncated_image_is_rejected(db, user):
+    with pytest.raises(HTTPException) as error:
+        await avatars.schedule_avatar_update(upload(png()[:-40]), user.id, None)
+    assert error.value.status_code == 400
+
+
+async def test_image_is_stored_in_background(db, user):
+    assert await avatars.schedule_avatar_update(upload(png()), user.id, None) == "pending"
+    await avatars.drain(timeout=10)
+
+    assert await avatars.get_status(user.id) == "done"
+    avatar = await db.scalar(select(User.avatar).where(User.id == user.id).execution_options(populate_existing=True))
+    assert avatar.startswith(settings.avatar_base_url)
+
+
+async def test_content_hash_keys_expire(db, user, redis_client):
+    data = png()
+    url = await avatars.store_avatar_image(data)
+
+    keys = await redis_client.keys(f"{avatars.HASH_PREFIX}*")
+    assert len(keys) == 2 and f"{avatars.HASH_PREFIX}{avatars.content_digest(data)}" in keys
+    for key in keys:
+        assert await redis_client.get(key) == url
+        assert 0 < await redis_client.ttl(key) <= avatars.HASH_TTL
+
+
+@pytest.fixture
+async def client(db, user):
+    token = create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=5))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        yield client
+
+
+def multipart(size: int) -> Tuple[bytes, str]:
+    boundary = "avatar-boundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        f"Content-Type: image/png\r\n\r\n"
+    ).encode() + b"\0" * size + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+async def test_oversized_upload_is_rejected_before_parsing(client, monkeypatch):
+    parsed = []
+    monkeypatch.setattr(auth_routes, "schedule_avatar_update", lambda *args: parsed.append(args))
+    body, content_type = multipart(settings.avatar_max_bytes + avatars.MULTIPART_OVERHEAD)
+
+    response = await client.patch(app.url_path_for("update_avatar"), content=body, headers={"Content-Type": content_type})
+    assert response.status_code == 413
+    assert parsed == []
+
+
+async def test_oversized_chunked_upload_is_cut_off(client):
+    limit = settings.avatar_max_bytes + avatars.MULTIPART_OVERHEAD
+    body, content_type = multipart(2 * limit)
+    received = []
+
+    async def chunks():
+        for start in range(0, len(body), 64 * 1024):
+            received.append(start)
+            yield body[start:start + 64 * 1024]
+
+    response = await client.patch(app.url_path_for("update_avatar"), content=chunks(), headers={"Content-Type": content_type})
+    assert response.status_code == 413
+    assert "content-length" not in response.request.headers
+    # Читання обривається на першому чанку понад ліміт.
+    assert received[-1] <= limit
+
+
+async def test_upload_within_limit_is_accepted(client):
+    response = await client.patch(app.url_path_for("update_avatar"), files={"file": ("a.png", png(), "image/png")})
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+    await avatars.drain(timeout=10)
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.src.repository import contacts as repository_contacts
+from app.src.schemas import ContactCreate, ContactUpdate
+from app.src.services import birthdays
+
+pytestmark = pytest.mark.anyio
+
+
+def contact(first_name, email, birthday):
+    return ContactCreate(
+        first_name=first_name, last_name="Melnyk", email=email,
+        phone_number="+380000000000", birthday=birthday
+    )
+
+
+def in_days(days):
+    day = date.today() + timedelta(days=days)
+    # 1992 — високосний рік, тож підходить і 29 лютого.
+    return date(1992, day.month, day.day)
+
+
+async def test_window_order_across_new_year(db, user):
+    today = date(2025, 12, 30)
+    for name, day in (("January", date(1990, 1, 2)), ("December", date(1990, 12, 31)), ("March", date(1990, 3, 1))):
+        await repository_contacts.create_contact(db, contact(name, f"{name.lower()}@example.com", day), user.id)
+    upcoming = await birthdays.upcoming_birthdays(db, user.id, days=7, today=today)
+    assert [c.first_name for c in upcoming] == ["December", "January"]
+
+
+async def test_cache_is_dropped_on_any_contact_change(db, user):
+    created = await repository_contacts.create_contact(
+        db, contact("Old", "first@example.com", in_days(2)), user.id
+    )
+    assert [c.first_name for c in await repository_contacts.upcoming_birthdays(db, user.id)] == ["Old"]
+
+    await repository_contacts.update_contact(db, created.id, ContactUpdate(first_name="New"), user.id)
+    assert [c.first_name for c in await repository_contacts.upcoming_birthdays(db, user.id)] == ["New"]
+
+    await repository_contacts.update_contact(db, created.id, ContactUpdate(birthday=in_days(30)), user.id)
+    assert await repository_contacts.upcoming_birthdays(db, user.id) == []
+
+    other = await repository_contacts.create_contact(
+        db, contact("Other", "second@example.com", in_days(1)), user.id
+    )
+    assert [c.id for c in await repository_contacts.upcoming_birthdays(db, user.id)] == [other.id]
+
+    await repository_contacts.delete_contact(db, other.id, user.id)
+    assert await repository_contacts.upcoming_birthdays(db, user.id) == []
@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.main import app
+from app.src.config.config import settings
+from app.src.database.base import AsyncSessionLocal
+from app.src.database.models import Contact, User
+from app.src.services.auth import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+def new_contact(first_name, email):
+    return {
+        "first_name": first_name, "last_name": "Melnyk", "email": email,
+        "phone_number": "+380000000000", "birthday": "1990-05-17",
+    }
+
+
+@pytest.fixture
+async def contacts(db, user):
+    other = User(email="other@example.com", password="x", confirmed=True)
+    db.add(other)
+    await db.flush()
+    rows = [
+        Contact(**{**new_contact(name, email), "birthday": date(1990, 5, 17)}, user_id=owner)
+        for name, email, owner in (
+            ("Olena", "olena@example.com", user.id),
+            ("Petro", "petro@example.com", user.id),
+            ("Foreign", "foreign@example.com", other.id),
+        )
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return [(row.id, row.user_id) for row in rows]
+
+
+@pytest.fixture
+async def client(db, user, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    token = create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=5))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        yield client
+
+
+async def stored(user_id):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Contact.email, Contact.first_name).where(Contact.user_id == user_id)
+        )
+        return dict(result.all())
+
+
+async def test_mixed_batch_reports_results_in_request_order(db, user, contacts, client):
+    (olena, _), (petro, _), (foreign, other_id) = contacts
+    response = await client.post("/contacts/batch", json={"operations": [
+        {"op": "delete", "id": petro},
+        {"op": "create", "data": new_contact("Iryna", "iryna@example.com")},
+        {"op": "update", "id": olena, "data": {"first_name": "Oksana"}},
+        {"op": "update", "id": foreign, "data": {"first_name": "Stolen"}},
+        {"op": "delete", "id": 999999},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["index"], r["op"], r["status"]) for r in results] == [
+        (0, "delete", "deleted"),
+        (1, "create", "created"),
+        (2, "update", "updated"),
+        (3, "update", "not_found"),
+        (4, "delete", "not_found"),
+    ]
+    assert results[0]["id"] == petro and results[2]["id"] == olena
+    assert await stored(user.id) == {"olena@example.com": "Oksana", "iryna@example.com": "Iryna"}
+    assert await stored(other_id) == {"foreign@example.com": "Foreign"}
+
+
+async def test_duplicate_email_create_is_reported_per_operation(db, user, contacts, client):
+    response = await client.post("/contacts/batch", json={"operations": [
+        {"op": "create", "data": new_contact("Again", "olena@example.com")},
+        {"op": "create", "data": new_contact("Iryna", "iryna@example.com")},
+        # Email контакту іншого користувача не заважає.
+        {"op": "create", "data": new_contact("Foreign", "foreign@example.com")},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["conflict", "created", "created"]
+    assert results[0]["detail"] == "A contact with this email already exists"
+    assert (await stored(user.id))["olena@example.com"] == "Olena"
+
+
+async def test_integrity_error_rolls_back_the_whole_batch(db, user, contacts, client):
+    (olena, _), (petro, _), _ = contacts
+    before = await stored(user.id)
+    response = await client.post("/contacts/batch", json={"operations": [
+        {"op": "create", "data": new_contact("Iryna", "iryna@example.com")},
+        {"op": "delete", "id": petro},
+        {"op": "update", "id": olena, "data": {"email": "petro@example.com"}},
+    ]})
+
+    assert response.status_code == 409
+    assert response.json()["detail"].startswith("Batch rejected, no changes were applied")
+    assert await stored(user.id) == before
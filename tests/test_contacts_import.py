@@ -0,0 +1,88 @@
+import pytest
+
+from app.src.services.contacts_import import iter_csv_records, iter_jsonl_records, iter_lines
+
+pytestmark = pytest.mark.anyio
+
+
+async def chunks_of(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def errors(records):
+    return [(row, str(value)) for row, value in records if isinstance(value, Exception)]
+
+
+async def test_lines_across_chunks():
+    lines = await collect(iter_lines(chunks_of("﻿a,b\r\nc,d\nласт".encode()), 100))
+    assert lines == ["a,b", "c,d", "ласт"]
+
+
+async def test_long_line_is_skipped_without_buffering():
+    data = b"short\n" + b"x" * 1000 + b"\nafter\n" + b"y" * 50
+    lines = await collect(iter_lines(chunks_of(data, 16), 20))
+    assert lines[0] == "short"
+    assert isinstance(lines[1], ValueError)
+    assert lines[2] == "after"
+    assert isinstance(lines[3], ValueError)
+    assert len(lines) == 4
+
+
+async def test_csv_quoted_newlines():
+    data = b'first_name,additional_info\nOlena,"line one\nline two"\nPetro,plain\n'
+    records = await collect(iter_csv_records(iter_lines(chunks_of(data), 100), 100))
+    assert records == [
+        (2, {"first_name": "Olena", "additional_info": "line one\nline two"}),
+        (4, {"first_name": "Petro", "additional_info": "plain"}),
+    ]
+
+
+async def test_csv_unclosed_quote_is_capped_and_parsing_recovers():
+    body = "".join(f"Name{i},info{i}\n" for i in range(50))
+    data = ('first_name,additional_info\nBroken,"oops\n' + body).encode()
+    records = await collect(iter_csv_records(iter_lines(chunks_of(data), 200), 200))
+    assert errors(records)[0][0] == 2
+    assert "unclosed" in errors(records)[0][1]
+    parsed = [record for _, record in records if isinstance(record, dict)]
+    assert parsed and parsed[-1] == {"first_name": "Name49", "additional_info": "info49"}
+
+
+async def test_jsonl_reports_bad_and_long_lines():
+    data = b'{"first_name": "Olena"}\nnot json\n' + b'{"x": "' + b"z" * 500 + b'"}\n{}\n'
+    records = await collect(iter_jsonl_records(iter_lines(chunks_of(data), 100)))
+    assert records[0] == (1, {"first_name": "Olena"})
+    assert [row for row, _ in errors(records)] == [2, 3]
+    assert records[-1] == (4, {})
+
+
+async def test_import_upserts_within_the_user(db, user):
+    from app.src.database.models import User
+    from app.src.repository import contacts as repository_contacts
+    from app.src.services.contacts_import import import_contacts
+
+    other = User(email="other@example.com", password="x", confirmed=True)
+    db.add(other)
+    await db.commit()
+    header = "first_name,last_name,email,phone_number,birthday\n"
+    shared = "Olena,Melnyk,shared@example.com,+380000000001,1990-05-17\n"
+    await import_contacts(db, chunks_of((header + shared).encode()), "csv", other.id)
+
+    data = header + shared.replace("Olena", "Oksana") + "Petro,Bondar,petro@example.com,+380000000002,1985-01-02\n"
+    report = await import_contacts(db, chunks_of(data.encode()), "csv", user.id)
+    assert report["imported"] == 2 and report["failed"] == 0
+
+    data = header + "Iryna,Melnyk,shared@example.com,+380000000003,1991-02-03\n"
+    report = await import_contacts(db, chunks_of(data.encode()), "csv", user.id)
+    assert report["imported"] == 1 and report["failed"] == 0
+
+    mine = await repository_contacts.get_contacts(db, user.id, sort="email")
+    assert [(c.email, c.first_name) for c in mine] == [
+        ("petro@example.com", "Petro"), ("shared@example.com", "Iryna")
+    ]
+    theirs = await repository_contacts.get_contacts(db, other.id)
+    assert [c.first_name for c in theirs] == ["Olena"]
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.main import app
+from app.src.config.config import settings
+from app.src.database.models import Contact
+from app.src.repository import contacts as repository_contacts
+from app.src.repository.read_models import ContactRow
+from app.src.services import fast_json
+from app.src.services.auth import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def contacts(db, user):
+    # Однакові дні народження перевіряють, що id розв'язує нічиї між сторінками;
+    # рядки без дня народження — контакти, створені до появи колонки.
+    for i in range(9):
+        db.add(Contact(
+            first_name=f"Name{i}", last_name=f"Last{i % 3}", email=f"c{i}@example.com",
+            phone_number="+380000000000",
+            birthday=None if i % 4 == 0 else date(1990, 1, 1) + timedelta(days=i // 2),
+            user_id=user.id,
+        ))
+    await db.commit()
+    return (await db.execute(Contact.__table__.select().order_by(Contact.id))).all()
+
+
+async def all_pages(db, user_id, sort, limit, read_model=None):
+    rows, cursor = [], None
+    while True:
+        page = await repository_contacts.get_contacts(
+            db, user_id, limit=limit, cursor=cursor, sort=sort, read_model=read_model
+        )
+        rows.extend(page)
+        cursor = repository_contacts.next_cursor(page, limit, sort)
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.parametrize("read_model", [None, ContactRow])
+@pytest.mark.parametrize("limit", [1, 2, 4, 100])
+async def test_keyset_pages_cover_every_contact_once(db, user, contacts, limit, read_model):
+    for sort in repository_contacts.SORT_KEYS:
+        rows = await all_pages(db, user.id, sort, limit, read_model)
+        ids = [row.id for row in rows]
+        assert len(ids) == len(set(ids)), sort
+        expected = [c for c in contacts if sort != "birthday" or c.birthday is not None]
+        assert set(ids) == {c.id for c in expected}, sort
+        key = [tuple(getattr(row, column.key) for column in repository_contacts.SORT_KEYS[sort]) for row in rows]
+        assert key == sorted(key), sort
+
+
+async def test_null_birthdays_are_served_by_both_paths(db, user, contacts, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    token = create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=5))
+    transport = httpx.ASGITransport(app=app)
+    bodies = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        for routes in ("", "contacts:list"):
+            monkeypatch.setattr(settings, "fast_json_routes", routes)
+            fast_json.enabled.cache_clear()
+            response = await client.get("/contacts/?limit=100")
+            assert response.status_code == 200
+            bodies.append(response.json())
+    fast_json.enabled.cache_clear()
+
+    assert bodies[0] == bodies[1]
+    assert sum(contact["birthday"] is None for contact in bodies[0]) == 3
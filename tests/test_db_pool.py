@@ -0,0 +1,58 @@
+import time
+
+import anyio
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.src.database.base import InstrumentedQueuePool, pool_connect_seconds, pool_wait_seconds
+
+pytestmark = pytest.mark.anyio
+
+
+def connect_seconds() -> float:
+    line = next(line for line in pool_connect_seconds.samples() if line.startswith("db_pool_connect_seconds_sum"))
+    return float(line.rsplit(" ", 1)[1])
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=5
+    )
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def slow_connect(dialect, conn_rec, cargs, cparams):
+        time.sleep(0.2)
+
+    yield engine
+    await engine.dispose()
+
+
+async def test_new_connection_is_not_reported_as_pool_wait(engine):
+    wait_before, connect_before = pool_wait_seconds.value(), connect_seconds()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert connect_seconds() - connect_before >= 0.2
+    assert pool_wait_seconds.value() - wait_before < 0.1
+
+
+async def test_exhausted_pool_wait_is_reported(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    wait_before, connect_before = pool_wait_seconds.value(), connect_seconds()
+
+    async def hold():
+        async with engine.connect():
+            await anyio.sleep(0.3)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(hold)
+        await anyio.sleep(0.05)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    assert pool_wait_seconds.value() - wait_before >= 0.2
+    assert connect_seconds() == connect_before
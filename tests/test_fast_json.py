@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.main import app
+from app.src.config.config import Settings, settings
+from app.src.database.models import Contact
+from app.src.services import fast_json
+from app.src.services.auth import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+ROUTES = {
+    "contacts:list": "/contacts/?limit=50&sort=name",
+    "contacts:search": "/contacts/search/?query=melnyk",
+    "contacts:birthdays": "/contacts/upcoming_birthdays/?days=30",
+}
+
+
+@pytest.fixture
+async def client(db, user, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    today = date.today()
+    for i in range(5):
+        day = today + timedelta(days=i * 3)
+        db.add(Contact(
+            first_name=f"Name{i}", last_name="Melnyk", email=f"c{i}@example.com",
+            phone_number=f"+38000000000{i}", birthday=date(1992, day.month, day.day),
+            additional_info=None if i % 2 else f"note {i}", user_id=user.id,
+        ))
+    await db.commit()
+    token = create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=5))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        yield client
+    fast_json.enabled.cache_clear()
+
+
+def set_fast_routes(monkeypatch, value):
+    monkeypatch.setattr(settings, "fast_json_routes", value)
+    fast_json.enabled.cache_clear()
+
+
+def test_disabled_by_default():
+    assert Settings.model_fields["fast_json_routes"].default == ""
+
+
+@pytest.mark.parametrize("route", sorted(ROUTES))
+async def test_fast_path_returns_the_same_body(client, monkeypatch, route):
+    set_fast_routes(monkeypatch, "")
+    regular = await client.get(ROUTES[route])
+    set_fast_routes(monkeypatch, route)
+    assert fast_json.enabled(route)
+    fast = await client.get(ROUTES[route])
+
+    assert regular.status_code == fast.status_code == 200
+    assert regular.json() and fast.json() == regular.json()
@@ -0,0 +1,34 @@
+"""
+Холодний імпорт app.main: ліниві модулі не завантажуються під час
+старту, а за IMPORT_TIME_BUDGET_MS — ще й час імпорту вкладається в бюджет.
+
+Вимірювання — benchmarks/import_time.py (сумарний час app.main за
+`python -X importtime`). Перевірка бюджету залежить від швидкості
+машини, тож вмикається лише явно, наприклад на виділеному раннері CI:
+    IMPORT_TIME_BUDGET_MS=1500 pytest tests/test_import_time.py
+"""
+import os
+import statistics
+
+import pytest
+
+from benchmarks import import_time
+
+
+@pytest.fixture(scope="module")
+def measured():
+    return import_time.measure_runs(import_time.MODULE, runs=3)
+
+
+def test_lazy_modules_are_not_imported_at_startup(measured):
+    _, median_run = measured
+    assert import_time.eager_modules(median_run) == []
+
+
+@pytest.mark.skipif(
+    "IMPORT_TIME_BUDGET_MS" not in os.environ, reason="set IMPORT_TIME_BUDGET_MS to check the budget"
+)
+def test_import_time_within_budget(measured):
+    totals, _ = measured
+    budget_ms = float(os.environ["IMPORT_TIME_BUDGET_MS"])
+    assert statistics.median(totals) <= budget_ms, f"import times {totals} ms, budget {budget_ms:.0f} ms"
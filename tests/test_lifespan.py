@@ -0,0 +1,35 @@
+import pytest
+
+import app.main as main
+from app.src.database import redis as redis_module
+from app.src.database.replicas import replica_router
+from app.src.services.user_cache import user_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_startup_and_shutdown(db, redis_client):
+    async with main.lifespan(main.app):
+        assert main.app.state.ready
+        assert user_cache._listener is not None
+    assert not main.app.state.ready
+    assert user_cache._listener is None
+    assert redis_module._redis_client is None
+
+
+async def test_failed_startup_stops_what_already_started(db, redis_client, monkeypatch):
+    async def failing_start():
+        raise RuntimeError("replica check exploded")
+
+    monkeypatch.setattr(replica_router, "start", failing_start)
+    shutdowns = []
+    monkeypatch.setattr(main.password_hasher, "shutdown", lambda: shutdowns.append("bcrypt"))
+
+    with pytest.raises(RuntimeError, match="replica check exploded"):
+        async with main.lifespan(main.app):
+            pytest.fail("the application must not start")
+
+    assert not main.app.state.ready
+    assert user_cache._listener is None
+    assert redis_module._redis_client is None
+    assert shutdowns == ["bcrypt"]
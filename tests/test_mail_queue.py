@@ -0,0 +1,125 @@
+import json
+
+import aiosmtplib
+import pytest
+
+from app.src.config.config import settings
+from app.src.services import mail_queue
+from app.src.services.smtp_sink import SMTPSink
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def sink(monkeypatch):
+    async with SMTPSink() as sink:
+        monkeypatch.setattr(settings, "mail_server", sink.host)
+        monkeypatch.setattr(settings, "mail_port", sink.port)
+        monkeypatch.setattr(settings, "mail_starttls", False)
+        monkeypatch.setattr(settings, "mail_ssl_tls", False)
+        yield sink
+
+
+async def enqueue_many(count):
+    for i in range(count):
+        await mail_queue.enqueue(f"user{i}@example.com", f"Subject {i}", f"<p>Body {i}</p>")
+
+
+async def test_batch_is_delivered(redis_client, sink):
+    await enqueue_many(3)
+    worker = mail_queue.MailWorker(pool_size=2)
+
+    assert await worker.process_batch(block_timeout=0.1) == 3
+    await worker.pool.close()
+
+    assert sorted(message["To"] for message in sink.messages) == [
+        "user0@example.com", "user1@example.com", "user2@example.com"
+    ]
+    assert sink.logins == [settings.mail_username] * 2
+    assert await redis_client.llen(mail_queue.QUEUE_KEY) == 0
+    assert await redis_client.llen(worker.processing_key) == 0
+    assert await redis_client.zcard(mail_queue.RETRY_KEY) == 0
+
+
+async def test_unreachable_server_schedules_retries(redis_client, sink, monkeypatch):
+    await sink.stop()
+    await enqueue_many(2)
+    worker = mail_queue.MailWorker(pool_size=1, max_attempts=2, retry_base_seconds=60)
+
+    assert await worker.process_batch(block_timeout=0.1) == 2
+    retries = await redis_client.zrange(mail_queue.RETRY_KEY, 0, -1, withscores=True)
+    assert len(retries) == 2
+    assert all(json.loads(raw)["attempts"] == 1 for raw, _ in retries)
+    assert await redis_client.llen(worker.processing_key) == 0
+
+    # Ще не настав час повтору: черга порожня.
+    assert await worker.process_batch(block_timeout=0.1) == 0
+
+    # Настав: друга невдала спроба вичерпує max_attempts.
+    monkeypatch.setattr(mail_queue.time, "time", lambda: retries[-1][1] + 1)
+    assert await worker.process_batch(block_timeout=0.1) == 2
+    assert await redis_client.zcard(mail_queue.RETRY_KEY) == 0
+    dead = [json.loads(raw) for raw in await redis_client.lrange(mail_queue.DEAD_KEY, 0, -1)]
+    assert [payload["attempts"] for payload in dead] == [2, 2]
+
+
+async def test_disconnect_replaces_connection_without_using_attempts(redis_client, sink):
+    await enqueue_many(3)
+    worker = mail_queue.MailWorker(pool_size=1)
+    connect = worker.pool._connect
+    connections = []
+
+    async def connect_dropping_second_message():
+        client = await connect()
+        connections.append(client)
+        if len(connections) == 1:
+            send_message, sent = client.send_message, []
+
+            async def send_then_drop(message):
+                if sent:
+                    client.close()
+                    raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+                sent.append(message)
+                return await send_message(message)
+
+            client.send_message = send_then_drop
+        return client
+
+    worker.pool._connect = connect_dropping_second_message
+    assert await worker.process_batch(block_timeout=0.1) == 3
+    await worker.pool.close()
+
+    assert len(connections) == 2
+    assert len(sink.messages) == 3
+    assert await redis_client.zcard(mail_queue.RETRY_KEY) == 0
+    assert await redis_client.llen(worker.processing_key) == 0
+
+
+async def test_recover_leaves_live_workers_alone(redis_client):
+    await enqueue_many(2)
+    busy = mail_queue.MailWorker(worker_id="busy", heartbeat_seconds=30)
+    await busy.heartbeat()
+    in_flight = await busy._next_batch(block_timeout=0.1)
+    assert len(in_flight) == 2
+
+    starting = mail_queue.MailWorker(worker_id="starting")
+    assert await starting.recover() == 0
+    assert sorted(await redis_client.lrange(busy.processing_key, 0, -1)) == sorted(in_flight)
+
+    # Серцебиття зникло: воркер вважається впалим, його листи повертаються в чергу.
+    await redis_client.delete(f"{mail_queue.HEARTBEAT_PREFIX}busy")
+    assert await starting.recover() == 2
+    assert await redis_client.llen(busy.processing_key) == 0
+    assert sorted(await redis_client.lrange(mail_queue.QUEUE_KEY, 0, -1)) == sorted(in_flight)
+    assert await redis_client.smembers(mail_queue.WORKERS_KEY) == set()
+
+
+async def test_stopped_worker_retires(redis_client, sink):
+    await enqueue_many(1)
+    worker = mail_queue.MailWorker(pool_size=1, worker_id="stopping")
+    worker.stop()
+    await worker.run()
+
+    assert await redis_client.exists(f"{mail_queue.HEARTBEAT_PREFIX}stopping") == 0
+    assert await redis_client.smembers(mail_queue.WORKERS_KEY) == set()
+    assert await redis_client.llen(mail_queue.QUEUE_KEY) == 1
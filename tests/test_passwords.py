@@ -0,0 +1,20 @@
+import asyncio
+
+from app.src.services.passwords import PasswordHasher
+
+
+def test_hasher_survives_several_event_loops():
+    hasher = PasswordHasher(rounds=4, workers=1, max_concurrency=1)
+
+    async def hash_concurrently():
+        # Одночасні операції при max_concurrency=1 змушують семафор чекати,
+        # тобто прив'язатися до поточного циклу подій.
+        hashes = await asyncio.gather(*(hasher.hash(f"password-{i}") for i in range(3)))
+        assert await hasher.verify("password-0", hashes[0])
+
+    try:
+        asyncio.run(hash_concurrently())
+        hasher.shutdown()
+        asyncio.run(hash_concurrently())
+    finally:
+        hasher.shutdown()
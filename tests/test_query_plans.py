@@ -0,0 +1,106 @@
+"""
+Плани запитів, які справді будує репозиторій контактів.
+
+Тест викликає функції репозиторію, перехоплює виконані SELECT-и разом
+із параметрами і повторює їх під EXPLAIN: план має використовувати
+очікуваний складений індекс (user_id, ...), а сторінки — ще й обходитися
+без окремого сортування.
+
+За замовчуванням перевіряється SQLite тестової бази; з TEST_DATABASE_URL
+на PostgreSQL послідовне сканування вимикається (enable_seqscan = off),
+бо на малих таблицях планувальник інакше законно обирає Seq Scan, а
+перевіряється саме те, що індекс придатний для запиту.
+"""
+import re
+from contextlib import contextmanager
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.src.database.base import engine
+from app.src.repository import contacts as repository_contacts
+from app.src.repository.read_models import ContactRow
+from app.src.services import birthdays
+
+pytestmark = pytest.mark.anyio
+
+# Останній контакт попередньої сторінки: з нього будується курсор.
+LAST_SEEN = SimpleNamespace(
+    id=100, email="m@example.com", last_name="Lee", first_name="Ann", birthday=date(1990, 1, 1)
+)
+
+PAGE_INDEXES = {
+    "id": "ix_contacts_user_id_id",
+    "email": "ix_contacts_user_id_email",
+    "name": "ix_contacts_user_id_last_name_first_name",
+    "birthday": "ix_contacts_user_id_birthday",
+}
+
+
+@contextmanager
+def captured_selects():
+    """Збирає (SQL, параметри) кожного SELECT, виконаного через engine."""
+    statements: List[Tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def explain(statement: str, parameters: Any) -> str:
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            rows = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in rows)
+        rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(row[-1] for row in rows)
+
+
+def sorts_separately(plan: str) -> bool:
+    return bool(re.search(r"USE TEMP B-TREE FOR ORDER BY|^\s*(->\s*)?(Incremental )?Sort\b", plan, re.M))
+
+
+async def only_plan(statements: List[Tuple[str, Any]]) -> str:
+    assert len(statements) == 1, statements
+    return await explain(*statements[0])
+
+
+@pytest.mark.parametrize("sort", sorted(PAGE_INDEXES))
+async def test_contacts_page_uses_sort_index(db, user, sort):
+    cursor = repository_contacts.encode_cursor(sort, LAST_SEEN)
+    with captured_selects() as statements:
+        await repository_contacts.get_contacts(
+            db, user.id, limit=50, cursor=cursor, sort=sort, read_model=ContactRow
+        )
+
+    plan = await only_plan(statements)
+    assert re.search(PAGE_INDEXES[sort], plan), plan
+    assert not sorts_separately(plan), plan
+
+
+async def test_get_contact_uses_primary_key(db, user):
+    with captured_selects() as statements:
+        await repository_contacts.get_contact(db, 100, user, read_model=ContactRow)
+
+    plan = await only_plan(statements)
+    # На PostgreSQL вистачає первинного ключа, на SQLite — (user_id, id).
+    assert re.search("contacts_pkey|ix_contacts_user_id_id|INTEGER PRIMARY KEY", plan), plan
+
+
+@pytest.mark.parametrize("today", [date(2026, 3, 1), date(2026, 12, 28)], ids=["window", "new-year"])
+async def test_upcoming_birthdays_use_mmdd_index(db, user, today):
+    with captured_selects() as statements:
+        await birthdays.upcoming_birthdays(db, user.id, days=7, today=today)
+
+    plan = await only_plan(statements)
+    assert "ix_contacts_user_id_birthday_mmdd" in plan, plan
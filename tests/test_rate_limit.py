@@ -0,0 +1,51 @@
+import httpx
+import pytest
+
+from app.main import app
+from app.src.config.config import settings
+from app.src.database.models import User
+from app.src.services.passwords import password_hasher
+from app.src.services.rate_limit import rate_limiter
+
+pytestmark = pytest.mark.anyio
+
+EMAIL = "victim@example.com"
+PASSWORD = "correct-horse"
+
+
+@pytest.fixture
+async def victim(db, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    rate_limiter.local.clear()
+    db.add(User(email=EMAIL, password=await password_hasher.hash(PASSWORD), confirmed=True))
+    await db.commit()
+    yield
+    rate_limiter.local.clear()
+
+
+def client_from(ip: str) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def login(client, password):
+    return await client.post("/auth/auth/login", data={"username": EMAIL, "password": password})
+
+
+async def test_failed_logins_from_one_ip_do_not_lock_out_the_owner(victim):
+    async with client_from("203.0.113.7") as attacker:
+        statuses = [(await login(attacker, "guess")).status_code for _ in range(6)]
+    assert statuses == [401] * 5 + [429]
+
+    async with client_from("198.51.100.20") as owner:
+        response = await login(owner, PASSWORD)
+    assert response.status_code == 200
+
+
+async def test_account_attempts_are_limited_per_ip(victim):
+    async with client_from("203.0.113.8") as client:
+        for _ in range(5):
+            assert (await login(client, "guess")).status_code == 401
+        response = await login(client, PASSWORD)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,122 @@
+import sqlite3
+
+import anyio
+import pytest
+from sqlalchemy import text
+
+from app.src.database.base import AsyncSessionLocal
+from app.src.database.replicas import ReplicaRouter, replica_router
+from app.src.repository import contacts as repository_contacts
+from app.src.schemas import ContactCreate
+from app.src.services import birthdays
+from app.src.services.response_cache import response_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_pins_reads_before_dropping_caches(db, user, monkeypatch):
+    calls = []
+
+    def recorder(name):
+        async def record(user_id):
+            calls.append((name, user_id))
+        return record
+
+    monkeypatch.setattr(replica_router, "mark_write", recorder("mark_write"))
+    monkeypatch.setattr(birthdays, "invalidate", recorder("birthdays"))
+    monkeypatch.setattr(response_cache, "bump", recorder("responses"))
+
+    await repository_contacts.create_contact(db, ContactCreate(
+        first_name="Olena", last_name="Melnyk", email="olena@example.com",
+        phone_number="+380000000000", birthday="1990-05-17"
+    ), user.id)
+
+    assert calls == [("mark_write", user.id), ("birthdays", user.id), ("responses", user.id)]
+
+
+@pytest.fixture
+async def router(tmp_path, redis_client):
+    """Маршрутизатор над двома локальними SQLite-репліками з позначкою імені."""
+    urls = []
+    for name in ("first", "second"):
+        path = tmp_path / f"{name}.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE replica (name TEXT)")
+            conn.execute("INSERT INTO replica VALUES (?)", (name,))
+        urls.append(f"sqlite+aiosqlite:///{path}")
+    router = ReplicaRouter(urls, max_lag=5, sticky_seconds=30, check_interval=1)
+    await router.check()
+    yield router
+    await router.stop()
+
+
+async def read_target(router, user_id=None):
+    factory = await router.read_session_factory(user_id)
+    if factory is AsyncSessionLocal:
+        return "primary"
+    async with factory() as session:
+        return await session.scalar(text("SELECT name FROM replica"))
+
+
+async def test_reads_rotate_over_healthy_replicas(router):
+    assert [replica.healthy for replica in router.replicas] == [True, True]
+    targets = [await read_target(router) for _ in range(4)]
+    assert targets == ["first", "second", "first", "second"]
+
+
+async def test_unreachable_replica_is_skipped(router, tmp_path):
+    broken = ReplicaRouter(
+        [f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db"],
+        max_lag=5, sticky_seconds=30, check_interval=1
+    )
+    healthy = list(router.replicas)
+    try:
+        await broken.check()
+        assert broken.replicas[0].healthy is False
+        router.replicas = healthy + broken.replicas
+        assert {await read_target(router) for _ in range(6)} == {"first", "second"}
+
+        router.replicas = broken.replicas
+        assert await read_target(router) == "primary"
+    finally:
+        router.replicas = healthy
+        await broken.stop()
+
+
+async def test_lagging_replica_falls_back_until_it_catches_up(router, monkeypatch):
+    lag = {"first": 0.0, "second": 60.0}
+
+    async def fake_lag(conn):
+        return lag[await conn.scalar(text("SELECT name FROM replica"))]
+
+    monkeypatch.setattr(router, "_lag", fake_lag)
+    await router.check()
+    assert [await read_target(router) for _ in range(3)] == ["first"] * 3
+
+    lag["first"] = 60.0
+    await router.check()
+    assert await read_target(router) == "primary"
+
+    lag["second"] = 1.0
+    await router.check()
+    assert await read_target(router) == "second"
+
+
+async def test_reads_stick_to_primary_after_write(router):
+    await router.mark_write(7)
+    assert await read_target(router, 7) == "primary"
+    assert await read_target(router, 8) != "primary"
+
+    # Інший воркер бачить позначку через Redis.
+    other = ReplicaRouter([], max_lag=5, sticky_seconds=30, check_interval=1)
+    other.replicas = router.replicas
+    assert await read_target(other, 7) == "primary"
+    assert await read_target(other, 8) != "primary"
+
+
+async def test_sticky_window_expires(router):
+    router.sticky_seconds = 0.05
+    await router.mark_write(7)
+    assert await read_target(router, 7) == "primary"
+    await anyio.sleep(0.1)
+    assert await read_target(router, 7) != "primary"
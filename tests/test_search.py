@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+
+from app.src.repository import contacts as repository_contacts
+from app.src.schemas import ContactCreate, ContactUpdate
+from app.src.services.search import NgramIndex
+
+
+def make_index(documents):
+    index = NgramIndex()
+    for contact_id, document in documents.items():
+        index.add(contact_id, document)
+    return index
+
+
+def test_whole_word_match_ranks_first():
+    index = make_index({
+        1: "Iryna Kovalenkova iryna@example.com",
+        2: "Ivan Kovalenko ivan@example.com",
+        3: "Petro Melnyk petro@example.com",
+    })
+    assert index.search("kovalenko") == [2, 1]
+
+
+def test_all_tokens_must_match():
+    index = make_index({
+        1: "Olena Shevchenko olena@example.com",
+        2: "Olena Kovalenko olena.k@example.com",
+    })
+    assert index.search("olena shevchenko") == [1]
+    assert index.search("SHEVCHENKO") == [1]
+
+
+def test_substring_and_short_queries():
+    index = make_index({
+        1: "Andrii Bondarenko andrii@example.com",
+        2: "Sofiia Tkachenko sofiia@example.com",
+    })
+    assert index.search("ndare") == [1]
+    assert index.search("an") == [1]
+    assert index.search("   ") == []
+
+
+def test_prefix_mode_matches_word_starts_only():
+    index = make_index({
+        1: "Ivan Kovalenko ivan@example.com",
+        2: "Iryna Kovalenkova iryna@example.com",
+        3: "Taras Ivanov taras@example.com",
+    })
+    assert index.search("kov", prefix=True) == [1, 2]
+    assert index.search("ova", prefix=True) == []
+    assert index.search("ova") == [2, 1]
+    assert index.search("ivan kov", prefix=True) == [1]
+
+
+def test_limit():
+    index = make_index({i: f"Melnyk{i} melnyk{i}@example.com" for i in range(1, 11)})
+    assert len(index.search("melnyk", limit=3)) == 3
+
+
+def contact(first_name, last_name, email):
+    return ContactCreate(
+        first_name=first_name, last_name=last_name, email=email,
+        phone_number="+380000000000", birthday=date(1990, 5, 17)
+    )
+
+
+@pytest.mark.anyio
+async def test_index_is_rebuilt_after_writes(db, user):
+    created = await repository_contacts.create_contact(
+        db, contact("Olena", "Shevchenko", "first@example.com"), user.id
+    )
+    found = await repository_contacts.search_contacts(db, "olena", user.id)
+    assert [c.id for c in found] == [created.id]
+
+    await repository_contacts.update_contact(db, created.id, ContactUpdate(first_name="Oksana"), user.id)
+    assert await repository_contacts.search_contacts(db, "olena", user.id) == []
+    found = await repository_contacts.search_contacts(db, "oksana", user.id)
+    assert [c.first_name for c in found] == ["Oksana"]
+
+    other = await repository_contacts.create_contact(
+        db, contact("Oksana", "Melnyk", "second@example.com"), user.id
+    )
+    found = await repository_contacts.search_contacts(db, "oksana", user.id)
+    assert {c.id for c in found} == {created.id, other.id}
+
+    await repository_contacts.delete_contact(db, created.id, user.id)
+    found = await repository_contacts.search_contacts(db, "oksana", user.id)
+    assert [c.id for c in found] == [other.id]
+
+
+@pytest.mark.anyio
+async def test_search_is_scoped_to_user(db, user):
+    from app.src.database.models import User
+
+    stranger = User(email="stranger@example.com", password="x", confirmed=True)
+    db.add(stranger)
+    await db.commit()
+    await repository_contacts.create_contact(
+        db, contact("Olena", "Shevchenko", "olena@example.com"), stranger.id
+    )
+    assert await repository_contacts.search_contacts(db, "olena", user.id) == []
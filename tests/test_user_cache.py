@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.src.database.models import User
+from app.src.services.auth import reset_user_password
+from app.src.services.tokens import get_token_service
+from app.src.services.user_cache import attach_cached_user, user_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cached_user_refuses_password_read(db, user):
+    await user_cache.set(user.email, user)
+    cached = await user_cache.get(user.email)
+    assert "password" not in cached
+
+    db.expunge_all()
+    attached = await attach_cached_user(cached, db)
+    assert (attached.id, attached.email, attached.confirmed) == (user.id, user.email, True)
+    with pytest.raises(InvalidRequestError, match="password"):
+        attached.password
+
+
+async def test_loaded_user_defers_password(db, user):
+    db.expunge_all()
+    loaded = (await db.execute(select(User).where(User.id == user.id))).scalar_one()
+    with pytest.raises(InvalidRequestError, match="password"):
+        loaded.password
+
+
+async def test_password_reset_writes_deferred_column(db, user):
+    token = get_token_service().encode({"sub": user.email, "type": "password_reset"})
+    assert await reset_user_password(token, "new-secret", db) is not None
+
+    stored = await db.scalar(select(User.password).where(User.id == user.id))
+    assert stored not in (None, "not-a-hash")